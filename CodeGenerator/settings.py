@@ -146,3 +146,69 @@ STATICFILES_DIRS = [
 ]
 
 UPLOAD_PATH = STATICFILES_DIRS[0] if DEBUG else STATIC_ROOT
+
+
+# Code generator
+
+# Seconds a cached language catalog is trusted before it is re-read (None - until a Function/Keyword changes)
+GENERATOR_CATALOG_TTL = 300
+
+# Archive compression: "stored", "deflated", "bzip2" or "lzma"; level 0-9 (None - library default, Python 3.7+)
+GENERATOR_ZIP_COMPRESSION = "deflated"
+GENERATOR_ZIP_COMPRESSLEVEL = None
+# Archives up to this many bytes are assembled in memory, larger ones in a temporary file
+GENERATOR_ARCHIVE_SPOOL_SIZE = 1024 * 1024
+
+# Number of highlighted files kept in memory by core.highlighting
+GENERATOR_HIGHLIGHT_CACHE_SIZE = 256
+
+# Lines of a file fetched at a time by the code view; shorter files are fetched whole
+GENERATOR_VIEW_PAGE_LINES = 500
+
+# Worker processes for bulk generation (None - number of CPUs)
+GENERATOR_WORKERS = None
+
+# Generate in the background: the admin enqueues a GenerationJob and polls it (needs `manage.py run_generation_jobs`)
+GENERATOR_ASYNC = True
+
+# Enqueue a regeneration when a template or its members are saved in the admin, debounced by DELAY seconds
+GENERATOR_REGENERATE_ON_SAVE = False
+GENERATOR_REGENERATE_DELAY = 10
+
+# Number of rendered member fragments (fields, accessors, methods) kept in memory for incremental regeneration
+GENERATOR_FRAGMENT_CACHE_SIZE = 20000
+
+# Emitter class per language name on top of the built-in ones in core.emitters,
+# e.g. {"Rust": "myapp.emitters.RustEmitter"}
+GENERATOR_EMITTERS = {}
+
+# Tokens accepted by the generation API (POST /api/generate/ with "Authorization: Token <token>"), empty - disabled
+GENERATOR_API_TOKENS = [x for x in os.environ.get("GENERATOR_API_TOKENS", "").split(",") if x]
+# Upper bound of variables and of methods in a class description posted to the API
+GENERATOR_API_MAX_MEMBERS = 1000
+
+# Per-stage timings and query counts of every generation, passed to the sinks below; the admin summary is at
+# /core/generationjob/stats/, linked from the list of generation jobs
+GENERATOR_METRICS = True
+GENERATOR_METRICS_SINKS = ["core.metrics.log_sink", "core.metrics.histogram_sink"]
+
+# The file handler opens its file on the first record, so the directory must exist by then
+os.makedirs(os.path.join(BASE_DIR, "logs"), exist_ok=True)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "file": {
+            "class": "logging.FileHandler",
+            "filename": os.path.join(BASE_DIR, "logs", "logfile.txt"),
+            "delay": True,
+        },
+    },
+    "loggers": {
+        "core": {
+            "handlers": ["file"],
+            "level": "INFO",
+        },
+    },
+}
@@ -16,6 +16,12 @@ Including another URLconf
 from django.contrib import admin
 from django.conf.urls import url, include
 
+from core.views import ArtifactDownloadView, ArtifactFileView, GenerateView
+
 urlpatterns = [
+    url(r'^api/generate/$', GenerateView.as_view(), name="api-generate"),
+    url(r'^artifacts/(?P<digest>[0-9a-f]{40})/$', ArtifactDownloadView.as_view(), name="artifact-download"),
+    url(r'^artifacts/(?P<digest>[0-9a-f]{40})/files/(?P<index>\d+)/$', ArtifactFileView.as_view(),
+        name="artifact-file"),
     url(r'', admin.site.urls)
 ]
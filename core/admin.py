@@ -1,12 +1,26 @@
+import hashlib
+
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth import models as auth_models
 from django.conf.urls import url
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
 from django.urls import reverse
 from django.utils.html import format_html
+from django.template.loader import get_template
 from django.template.response import TemplateResponse
+from django.utils.cache import add_never_cache_headers, get_conditional_response
+from django.utils.functional import cached_property
+from django.utils.http import quote_etag
 
-from core import models
+from core import jobs, models
+from core.bulk import generate_fanout
 from core.generator import CodeGenerator
+from core.highlighting import highlighter
+from core.metrics import histogram
 
 
 class RemovePermissionMixin(object):
@@ -35,6 +49,28 @@ class RemovePermissionMixin(object):
         return actions
 
 
+class EstimatedCountPaginator(Paginator):
+    """
+    Takes the size of an unfiltered table from the PostgreSQL planner statistics instead of COUNT(*),
+    which scans the whole table. Small tables, filtered lists and other databases are counted exactly.
+    """
+
+    EXACT_BELOW = 10000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, "query", None)
+        if query is not None and not query.where:
+            connection = connections[self.object_list.db]
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT reltuples FROM pg_class WHERE relname = %s", [query.model._meta.db_table])
+                    row = cursor.fetchone()
+                if row and row[0] >= self.EXACT_BELOW:
+                    return int(row[0])
+        return super().count
+
+
 @admin.register(models.Language)
 class LanguageAdmin(RemovePermissionMixin, admin.ModelAdmin):
     CLOSED_PERMISSIONS = ["add", "delete"]
@@ -79,39 +115,146 @@ class CodeTemplateAdmin(RemovePermissionMixin, admin.ModelAdmin):
     CLOSED_PERMISSIONS = ["delete"]
     search_fields = ("language__name", "name")
     list_display = ("language", "name", "create_dt", "view_actions")
+    list_select_related = ("language",)
+    ordering = ("-create_dt",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     exclude = ("created_file", )
     icon = '<i class="material-icons">code</i>'
     inlines = [AddOnesInline, AddOnesFuncInline]
 
-    def process_view(self, request, template_id):
-        code = self.get_object(request, template_id)
+    @property
+    def generate_async(self):
+        return getattr(settings, "GENERATOR_ASYNC", False)
+
+    def job_response(self, request, code, job):
         context = {
-            "code": CodeGenerator(code).generate(),
-            "title": "{} | {}".format(code.language, code.name),
-            "code_obj": code
+            "title": code.name,
+            "code_obj": code,
+            "job": job,
+            "status_url": reverse('admin:generation-job-status', args=[code.pk, job.pk])
         }
-        return TemplateResponse(request, 'code_view.html', context)
+        response = TemplateResponse(request, 'code_wait.html', context)
+        add_never_cache_headers(response)
+        return response
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        if getattr(settings, "GENERATOR_REGENERATE_ON_SAVE", False):
+            code = form.instance
+            delay = getattr(settings, "GENERATOR_REGENERATE_DELAY", 10)
+            transaction.on_commit(lambda: jobs.enqueue(code, delay=delay))
+
+    @cached_property
+    def page_version(self):
+        """Changes with the code page itself (template, stylesheet, page size), unlike the artifact digest."""
+        digest = hashlib.sha1(get_template('code_view.html').template.source.encode("utf-8"))
+        digest.update(highlighter.styles.encode("utf-8"))
+        digest.update(str(getattr(settings, "GENERATOR_VIEW_PAGE_LINES", 500)).encode("utf-8"))
+        return digest.hexdigest()[:12]
+
+    def code_response(self, request, code, artifact, title):
+        """The index of the artifact's files; the page fetches every file (or its lines page by page) when opened."""
+        etag = quote_etag("{}-{}".format(artifact.digest, self.page_version))
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            context = {
+                "styles": highlighter.styles,
+                "title": title,
+                "code_obj": code,
+                "archive_url": reverse('artifact-download', args=[artifact.digest]),
+                "page_lines": getattr(settings, "GENERATOR_VIEW_PAGE_LINES", 500),
+                "files": [{"name": f["name"], "lines": f.get("lines", 0),
+                           "url": reverse('artifact-file', args=[artifact.digest, index])}
+                          for index, f in enumerate(artifact.files)]
+            }
+            response = TemplateResponse(request, 'code_view.html', context)
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+    def process_view(self, request, template_id):
+        code = self.get_object(request, template_id)
+        generator = CodeGenerator(code)
+        artifact = generator.get_artifact(build=not self.generate_async)
+        if artifact is None:
+            response = self.job_response(request, code, jobs.enqueue(code))
+        else:
+            generator.attach(artifact)
+            response = self.code_response(request, code, artifact, "{} | {}".format(code.language, code.name))
+        generator.trace.report()
+        response["Server-Timing"] = generator.trace.server_timing()
+        return response
+
+    def process_view_all(self, request, template_id):
+        code = self.get_object(request, template_id)
+        artifact = generate_fanout(code, build=not self.generate_async)
+        if artifact is None:
+            return self.job_response(request, code, jobs.enqueue(code, fanout=True))
+
+        return self.code_response(request, code, artifact, "Всі мови | {}".format(code.name))
+
+    def process_job_status(self, request, template_id, job_id):
+        job = get_object_or_404(models.GenerationJob.objects.only("status", "error"),
+                                pk=job_id, template_id=template_id)
+        return JsonResponse({"id": job.pk, "status": job.status, "error": job.error})
 
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
             url(
                 r'^(?P<template_id>.+)/view-code/$',
-                self.admin_site.admin_view(self.process_view),
+                self.admin_site.admin_view(self.process_view, cacheable=True),
                 name='view-code',
+            ),
+            url(
+                r'^(?P<template_id>.+)/view-code-all/$',
+                self.admin_site.admin_view(self.process_view_all, cacheable=True),
+                name='view-code-all',
+            ),
+            url(
+                r'^(?P<template_id>.+)/jobs/(?P<job_id>\d+)/status/$',
+                self.admin_site.admin_view(self.process_job_status),
+                name='generation-job-status',
             )
         ]
         return custom_urls + urls
 
     def view_actions(self, obj):
         return format_html(
-            '<a class="button" href="{}">Згенерувати код</a>',
-            reverse('admin:view-code', args=[obj.pk])
+            '<a class="button" href="{}">Згенерувати код</a> <a class="button" href="{}">Всі мови</a>',
+            reverse('admin:view-code', args=[obj.pk]),
+            reverse('admin:view-code-all', args=[obj.pk])
         )
 
     view_actions.short_description = 'Дії'
     view_actions.allow_tags = True
 
 
+@admin.register(models.GenerationJob)
+class GenerationJobAdmin(RemovePermissionMixin, admin.ModelAdmin):
+    CLOSED_PERMISSIONS = ["add"]
+    list_display = ("template", "fanout", "status", "create_dt", "finish_dt")
+    readonly_fields = ("template", "fanout", "status", "artifact", "error", "create_dt", "run_after", "start_dt",
+                       "finish_dt")
+    list_filter = ("status", "fanout")
+    list_select_related = ("template__language",)
+    change_list_template = "generation_job_list.html"
+    icon = '<i class="material-icons">schedule</i>'
+
+    def process_stats(self, request):
+        context = {"title": "Статистика генерації", "stages": histogram.summary()}
+        response = TemplateResponse(request, 'generation_stats.html', context)
+        add_never_cache_headers(response)
+        return response
+
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            url(r'^stats/$', self.admin_site.admin_view(self.process_stats), name='generation-stats')
+        ]
+        return custom_urls + urls
+
+
 admin.site.unregister(auth_models.Group)
 admin.site.unregister(auth_models.User)
@@ -0,0 +1,81 @@
+import hmac
+
+from django.conf import settings
+
+from .generator import CodeGenerator
+from .models import AddOnes, CodeTemplate, FuncAddOnes, Language
+from .snapshot import Method, TemplateSnapshot, Variable
+
+
+class SpecError(ValueError):
+    pass
+
+
+def authorized(request):
+    """The request carries `Authorization: Token <token>` with one of GENERATOR_API_TOKENS."""
+    header = request.META.get("HTTP_AUTHORIZATION", "")
+    scheme, _, token = header.partition(" ")
+    if scheme.lower() != "token" or not token:
+        return False
+    token = token.strip().encode("utf-8")
+    return any(hmac.compare_digest(token, allowed.encode("utf-8"))
+               for allowed in getattr(settings, "GENERATOR_API_TOKENS", []))
+
+
+def field(data, name, model, required=True, default=""):
+    value = data.get(name, default)
+    if value is None or value == "":
+        if required:
+            raise SpecError("'{}' is required".format(name))
+        return default
+    if not isinstance(value, str):
+        raise SpecError("'{}' must be a string".format(name))
+    max_length = model._meta.get_field(name).max_length
+    if max_length and len(value) > max_length:
+        raise SpecError("'{}' is longer than {} characters".format(name, max_length))
+    return value
+
+
+def members(data, key, parse):
+    items = data.get(key) or []
+    if not isinstance(items, list) or not all(isinstance(x, dict) for x in items):
+        raise SpecError("'{}' must be a list of objects".format(key))
+    if len(items) > getattr(settings, "GENERATOR_API_MAX_MEMBERS", 1000):
+        raise SpecError("Too many {}".format(key))
+    return [parse(x) for x in items]
+
+
+def parse_variable(data):
+    return Variable(field(data, "name", AddOnes), field(data, "v_type", AddOnes),
+                    field(data, "default", AddOnes, required=False, default=None))
+
+
+def parse_method(data):
+    return Method(field(data, "name", FuncAddOnes), field(data, "f_type", FuncAddOnes),
+                  field(data, "params", FuncAddOnes, required=False))
+
+
+def get_language(data, default=None):
+    name = data.get("language")
+    if not name:
+        if default is None:
+            raise SpecError("'language' is required")
+        return default
+    return Language.objects.get(name=name)
+
+
+def generator_for(data):
+    """
+    A CodeGenerator for a request body: either {"template_id": 1, "language": "Java"} (the language is
+    optional) or a class description {"name", "language", "variables": [{"name", "v_type", "default"}],
+    "methods": [{"name", "f_type", "params"}]}. Only reads from the database.
+    """
+    if not isinstance(data, dict):
+        raise SpecError("Expected a JSON object")
+    if data.get("template_id") is not None:
+        code_template = CodeTemplate.objects.select_related("language").get(pk=int(data["template_id"]))
+        snapshot = TemplateSnapshot.load(code_template)
+        return CodeGenerator(snapshot, language=get_language(data, code_template.language))
+
+    return CodeGenerator.from_spec(field(data, "name", CodeTemplate), get_language(data),
+                                   members(data, "variables", parse_variable), members(data, "methods", parse_method))
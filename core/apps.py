@@ -5,3 +5,5 @@ class CoreConfig(AppConfig):
     name = 'core'
     verbose_name = "Налаштування"
 
+    def ready(self):
+        from core import signals  # noqa: F401
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import posixpath
+import tempfile
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+from core.utils import InMemoryZip
+from .highlighting import highlighter
+from .models import fs
+
+
+class Artifact(object):
+
+    def __init__(self, digest, archive, files):
+        self.digest = digest
+        self.archive = archive
+        self.files = files
+
+    def to_json(self):
+        return json.dumps({"digest": self.digest, "archive": self.archive, "files": self.files})
+
+    @classmethod
+    def from_json(cls, data):
+        data = json.loads(data)
+        return cls(data["digest"], data["archive"], data["files"])
+
+
+class ArtifactStore(object):
+    """
+    Generation results stored by content: the directory of an artifact is the fingerprint of the
+    template snapshot and language catalog it was generated from, so a repeated generation of an
+    unchanged template finds the previous result instead of writing a new one.
+
+    Every file is kept as its own source and highlighted HTML, so files are written and read back one
+    at a time. Sources, HTML and archives are blobs named by the hash of their content and shared by
+    all artifacts (and templates) with equal content; the manifest only lists their names. Blobs no
+    manifest refers to are removed by the `gc_artifacts` command.
+    """
+
+    ROOT = "artifacts"
+    BLOBS = "blobs"
+    ARCHIVES = "archives"
+    MANIFEST = "manifest.json"
+
+    def __init__(self, storage=fs):
+        self.storage = storage
+
+    def directory(self, digest):
+        return posixpath.join(self.ROOT, digest[:2], digest)
+
+    def owns(self, name):
+        return bool(name) and name.startswith(self.ROOT + "/")
+
+    def reuse(self, name):
+        """
+        Whether the stored `name` can be reused; its modification time is refreshed, so the collector
+        (`core.gc`) does not take a blob that a new manifest is about to list for an old orphan.
+        """
+        if not self.storage.exists(name):
+            return False
+        try:
+            os.utime(self.storage.path(name), None)
+        except NotImplementedError:
+            pass
+        except FileNotFoundError:
+            return False
+        return True
+
+    def put(self, data):
+        """Stores `data` (bytes) under its content hash unless an equal blob exists; returns the blob name."""
+        digest = hashlib.sha1(data).hexdigest()
+        name = posixpath.join(self.ROOT, self.BLOBS, digest[:2], digest)
+        if self.reuse(name):
+            return name
+        return self.storage.save(name, ContentFile(data))
+
+    def put_archive(self, digest, archive_name, archive):
+        name = posixpath.join(self.ROOT, self.ARCHIVES, digest[:2], digest, self.storage.get_valid_name(archive_name))
+        if self.reuse(name):
+            return name
+        return self.storage.save(name, archive.as_file(archive_name))
+
+    def load(self, digest):
+        manifest = posixpath.join(self.directory(digest), self.MANIFEST)
+        if not self.storage.exists(manifest):
+            return None
+        with self.storage.open(manifest, "rb") as f:
+            return Artifact.from_json(f.read().decode("utf-8"))
+
+    def read(self, name):
+        with self.storage.open(name, "rb") as f:
+            return f.read().decode("utf-8")
+
+    def iter_files(self, artifact, highlighted=True):
+        """Yields `{"name", "source", "content", "lexer"}` of every file, reading one file at a time."""
+        for f in artifact.files:
+            yield {"name": f["name"], "source": self.read(f["source"]),
+                   "content": self.read(f["content"]) if highlighted else None, "lexer": f.get("lexer", "text")}
+
+    def save(self, digest, archive_name, files):
+        """
+        Stores `files`, an iterable of `{"name", "source", "content", "lexer"}` with `content` highlighted,
+        consuming it one file at a time; the archive is assembled in memory and only spills to a temporary
+        file beyond GENERATOR_ARCHIVE_SPOOL_SIZE bytes. The manifest keeps the lexer and line count of every
+        file for the paged code view.
+
+        Zip entries carry timestamps, so archives are identified by their file names and sources.
+        """
+        entries = []
+        archive_digest = hashlib.sha1(archive_name.encode("utf-8"))
+        spool_size = getattr(settings, "GENERATOR_ARCHIVE_SPOOL_SIZE", 1024 * 1024)
+        with tempfile.SpooledTemporaryFile(max_size=spool_size) as fileobj:
+            archive = InMemoryZip.from_settings(fileobj)
+            try:
+                for f in files:
+                    archive.append(f["name"], f["source"])
+                    source = f["source"].encode("utf-8")
+                    entries.append({"name": f["name"], "source": self.put(source),
+                                    "content": self.put(f["content"].encode("utf-8")),
+                                    "lexer": f.get("lexer", "text"), "lines": highlighter.line_count(f["source"])})
+                    archive_digest.update(b"\0" + f["name"].encode("utf-8") + b"\0" + source)
+            finally:
+                # Before the temporary file, also when generation fails halfway
+                archive.close()
+            archive = self.put_archive(archive_digest.hexdigest(), archive_name, archive)
+        artifact = Artifact(digest, archive, entries)
+        # The manifest is written last, an artifact without one is never served
+        self.storage.save(posixpath.join(self.directory(digest), self.MANIFEST),
+                          ContentFile(artifact.to_json().encode("utf-8")))
+        return artifact
+
+
+artifacts = ArtifactStore()
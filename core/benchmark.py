@@ -0,0 +1,162 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test.utils import CaptureQueriesContext
+
+from core.utils import InMemoryZip
+from . import packs
+from .catalog import catalogs
+from .emitters.base import fragments
+from .generator import CodeGenerator
+from .highlighting import highlighter
+from .models import AddOnes, CodeTemplate, FuncAddOnes, Language
+from .snapshot import TemplateSnapshot
+
+
+STAGES = ("load", "emit", "emit_warm", "highlight", "zip")
+# Queries allowed per stage: the template with its language, both member lists and a cold catalog
+QUERY_BUDGET = {"load": 5}
+TYPES = ("int", "float", "str", "bool")
+DATABASE_ALIAS = "benchmark"
+
+
+@contextmanager
+def benchmark_database():
+    """
+    An in-memory SQLite database seeded with the default and benchmark language packs. It is added as
+    its own alias and stands in for the default connection of this thread while the benchmark runs, so
+    the configured databases are never written to.
+    """
+    connections.databases[DATABASE_ALIAS] = {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+    database = connections[DATABASE_ALIAS]
+    default = connections[DEFAULT_DB_ALIAS]
+    try:
+        database.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        connections[DEFAULT_DB_ALIAS] = database
+        for path in (packs.DEFAULT_PACK, packs.BENCHMARK_PACK):
+            with open(path, encoding="utf-8") as f:
+                packs.import_catalog(json.load(f))
+        yield
+    finally:
+        connections[DEFAULT_DB_ALIAS] = default
+        database.close()
+        del connections[DATABASE_ALIAS]
+        del connections.databases[DATABASE_ALIAS]
+
+
+def create_template(language, size):
+    code_template = CodeTemplate.objects.create(language=language, name="Bench{}".format(size))
+    AddOnes.objects.bulk_create([
+        AddOnes(template=code_template, name="field{}".format(i), v_type=TYPES[i % len(TYPES)], default=str(i))
+        for i in range(size)])
+    FuncAddOnes.objects.bulk_create([
+        FuncAddOnes(template=code_template, name="method{}".format(i), f_type=TYPES[i % len(TYPES)])
+        for i in range(size)])
+    return CodeTemplate.objects.get(pk=code_template.pk)
+
+
+class Measurement(object):
+
+    def __init__(self, language, size, stage):
+        self.language = language
+        self.size = size
+        self.stage = stage
+        self.seconds = None
+        self.queries = 0
+        self.peak_kb = 0
+
+    def as_dict(self):
+        return {"language": self.language, "size": self.size, "stage": self.stage,
+                "seconds": self.seconds, "queries": self.queries, "peak_kb": self.peak_kb}
+
+
+class Benchmark(object):
+    """
+    Measures every generation stage for synthetic templates of growing size. Each stage runs cold
+    (caches cleared) `repeat` times for the best wall time, once under `tracemalloc` for peak memory.
+    """
+
+    def __init__(self, sizes, languages=None, repeat=3, memory=True):
+        self.sizes = sizes
+        self.languages = languages
+        self.repeat = repeat
+        self.memory = memory
+
+    def stages(self, code_template):
+        state = {}
+
+        def load():
+            catalogs.invalidate()
+            state["generator"] = CodeGenerator(TemplateSnapshot.queryset().get(pk=code_template.pk))
+
+        def emit():
+            fragments.clear()
+            state["files"] = state["generator"].emitter.generate()
+
+        def emit_warm():
+            state["generator"].emitter.generate()
+
+        def highlight():
+            highlighter.clear()
+            for f in state["files"]:
+                highlighter.highlight(f["content"], state["generator"].emitter.LEXER)
+
+        def zip_files():
+            archive = InMemoryZip.from_settings()
+            for f in state["files"]:
+                archive.append(f["name"], f["content"])
+            archive.read()
+
+        return zip(STAGES, (load, emit, emit_warm, highlight, zip_files))
+
+    def measure(self, language, size, stage, func):
+        result = Measurement(language.name, size, stage)
+        for attempt in range(self.repeat):
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                func()
+                seconds = time.perf_counter() - start
+            if result.seconds is None or seconds < result.seconds:
+                result.seconds = seconds
+            result.queries = len(queries.captured_queries)
+
+        if self.memory:
+            tracemalloc.start()
+            func()
+            result.peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
+        return result
+
+    def run(self):
+        languages = Language.objects.order_by("pk")
+        if self.languages:
+            languages = languages.filter(name__in=self.languages)
+        results = []
+        for language in languages:
+            for size in self.sizes:
+                code_template = create_template(language, size)
+                for stage, func in self.stages(code_template):
+                    results.append(self.measure(language, size, stage, func))
+        return results
+
+
+def budget_violations(results):
+    return [r for r in results if r.queries > QUERY_BUDGET.get(r.stage, 0)]
+
+
+def save(results, path):
+    with open(path, "w") as f:
+        json.dump({"results": [r.as_dict() for r in results]}, f, indent=2)
+
+
+def compare(results, path):
+    """Yields (measurement, baseline seconds, ratio) for every measurement present in the baseline."""
+    with open(path) as f:
+        baseline = {(r["language"], r["size"], r["stage"]): r for r in json.load(f)["results"]}
+    for result in results:
+        previous = baseline.get((result.language, result.size, result.stage))
+        if previous and previous["seconds"]:
+            yield result, previous["seconds"], result.seconds / previous["seconds"]
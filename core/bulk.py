@@ -0,0 +1,129 @@
+import hashlib
+import posixpath
+from collections import namedtuple
+
+from django.db.models import Case, CharField, QuerySet, Value, When
+
+from core.utils import InMemoryZip
+from .artifacts import artifacts
+from .catalog import catalogs
+from .executor import GenerationExecutor
+from .generator import CodeGenerator
+from .models import CodeTemplate, Language
+from .snapshot import TemplateSnapshot
+
+
+BulkResult = namedtuple("BulkResult", ["template", "language", "artifact"])
+
+BATCH_SIZE = 500
+
+
+def resolve_languages(languages):
+    if languages is None:
+        return None
+    names = [x for x in languages if not isinstance(x, Language)]
+    found = {x.name: x for x in Language.objects.filter(name__in=names)} if names else {}
+    missing = set(names) - set(found)
+    if missing:
+        raise Language.DoesNotExist("Unknown languages: {}".format(", ".join(sorted(missing))))
+    return [x if isinstance(x, Language) else found[x] for x in languages]
+
+
+def iter_template_batches(templates, batch_size=BATCH_SIZE):
+    """Yields lists of CodeTemplates with their language loaded, one query per batch."""
+    if isinstance(templates, QuerySet):
+        pks = list(templates.order_by("pk").values_list("pk", flat=True))
+    else:
+        pks = [x.pk if isinstance(x, CodeTemplate) else int(x) for x in templates]
+
+    for start in range(0, len(pks), batch_size):
+        batch = pks[start:start + batch_size]
+        loaded = TemplateSnapshot.queryset().in_bulk(batch)
+        yield [loaded[pk] for pk in batch if pk in loaded]
+
+
+def attach_archives(attached):
+    """Points `created_file` of every (template, archive) pair to its archive with a single UPDATE."""
+    if not attached:
+        return
+    for code_template, archive in attached:
+        created_file = code_template.created_file
+        if created_file and not artifacts.owns(created_file.name):
+            created_file.delete(save=False)
+        code_template.created_file = archive
+    CodeTemplate.objects.filter(pk__in=[t.pk for t, _ in attached]).update(created_file=Case(
+        *[When(pk=t.pk, then=Value(archive)) for t, archive in attached], output_field=CharField()))
+
+
+def iter_generate_many(templates, languages=None, attach=True, batch_size=BATCH_SIZE, workers=1):
+    """
+    Generates every template for each of `languages` (its own language when omitted).
+
+    Templates may be a queryset, CodeTemplate instances or primary keys. Results generated for the
+    template's own language are attached to its `created_file` unless `attach` is False. With
+    `workers` > 1 (None - `GENERATOR_WORKERS` or the CPU count) rendering runs in worker processes.
+    """
+    languages = resolve_languages(languages)
+    with GenerationExecutor(workers) as executor:
+        for batch in iter_template_batches(templates, batch_size):
+            snapshots = TemplateSnapshot.load_many(batch)
+            pairs = [(code_template, language) for code_template in batch
+                     for language in languages or [code_template.language]]
+            jobs = [(snapshot.with_language(language), catalogs.get(language))
+                    for code_template, snapshot in zip(batch, snapshots)
+                    for language in languages or [code_template.language]]
+
+            results = []
+            attached = []
+            for (code_template, language), artifact in zip(pairs, executor.map(jobs)):
+                results.append(BulkResult(code_template, language, artifact))
+                if attach and language.pk == code_template.language_id and \
+                        code_template.created_file.name != artifact.archive:
+                    attached.append((code_template, artifact.archive))
+            attach_archives(attached)
+            for result in results:
+                yield result
+
+
+def generate_many(templates, languages=None, attach=True, batch_size=BATCH_SIZE, workers=1):
+    return list(iter_generate_many(templates, languages, attach, batch_size, workers))
+
+
+def pack(results, fileobj=None):
+    """Writes the sources of all results into one archive, a folder per template and language."""
+    archive = InMemoryZip.from_settings(fileobj)
+    for result in results:
+        folder = "{}_{}_[{}]".format(result.template.pk, result.template.name, result.language.name)
+        for f in artifacts.iter_files(result.artifact, highlighted=False):
+            archive.append(posixpath.join(folder, f["name"]), f["source"])
+    return archive.close()
+
+
+def generate_fanout(code_template, languages=None, workers=1, build=True):
+    """
+    Generates one template for several languages (by default all of them whose catalog has a class
+    template, the others cannot be rendered) into a single artifact.
+
+    The template's own language is ignored: its members are loaded once and rendered by every
+    language, files are placed in a folder per language inside one archive. With `build` False
+    only a previously stored artifact is returned (or None).
+    """
+    if languages is None:
+        languages = [language for language in Language.objects.order_by("pk")
+                     if "__class__" in catalogs.get(language).keywords]
+    else:
+        languages = resolve_languages(languages)
+    snapshot = TemplateSnapshot.load(code_template)
+    jobs = [(snapshot.with_language(language), catalogs.get(language)) for language in languages]
+
+    fingerprints = [CodeGenerator(job_snapshot, catalog=catalog).fingerprint() for job_snapshot, catalog in jobs]
+    digest = hashlib.sha1("\0".join(["fanout"] + fingerprints).encode("utf-8")).hexdigest()
+    artifact = artifacts.load(digest)
+    if artifact is not None or not build:
+        return artifact
+
+    with GenerationExecutor(workers) as executor:
+        results = executor.map(jobs)
+    files = (dict(f, name=posixpath.join(language.name, f["name"]))
+             for language, result in zip(languages, results) for f in artifacts.iter_files(result))
+    return artifacts.save(digest, "{}_[all].zip".format(snapshot.name), files)
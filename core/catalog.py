@@ -0,0 +1,116 @@
+import hashlib
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+
+from . import emitters
+from .compiler import compile_template, indent_lines
+from .models import Function, Keyword
+
+
+Template = namedtuple("Template", ["value", "template"])
+
+
+class LanguageCatalog(object):
+    """All keyword and function templates of a single language, loaded in one go."""
+
+    def __init__(self, language_id, name, keywords, functions):
+        self.language_id = language_id
+        self.name = name
+        self.keywords = keywords
+        self.functions = functions
+        self.version = self.fingerprint(name, keywords, functions)
+        self.loaded_at = time.monotonic()
+        self._compiled = {}
+
+    @staticmethod
+    def fingerprint(name, keywords, functions):
+        digest = hashlib.sha1(name.encode("utf-8"))
+        for prefix, templates in (("k", keywords), ("f", functions)):
+            for value in sorted(templates):
+                digest.update("\0{}\0{}\0{}".format(prefix, value, templates[value]).encode("utf-8"))
+        return digest.hexdigest()
+
+    @classmethod
+    def load(cls, language):
+        """Database templates of the language on top of the defaults built into its emitter."""
+        emitter = emitters.find(language.name)
+        keywords = dict(emitter.DEFAULT_KEYWORDS if emitter else {})
+        keywords.update(Keyword.objects.filter(language_id=language.pk).values_list("value", "template"))
+        functions = dict(emitter.DEFAULT_FUNCTIONS if emitter else {})
+        functions.update(Function.objects.filter(language_id=language.pk).values_list("value", "template"))
+        return cls(language.pk, language.name, keywords, functions)
+
+    def get_function(self, value):
+        if value not in self.functions:
+            return None
+        return Template(value, self.functions[value])
+
+    def templates(self, values):
+        return [Template(value, self.functions[value]) for value in values if value in self.functions]
+
+    def keyword_template(self, value, indent=0):
+        return self._compile("keyword", self.keywords, value, indent, False)
+
+    def function_template(self, value, indent=0, literal=False):
+        return self._compile("function", self.functions, value, indent, literal)
+
+    def _compile(self, kind, templates, value, indent, literal):
+        key = (kind, value, indent, literal)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = self._compiled[key] = compile_template(indent_lines(templates[value], indent), literal)
+        return compiled
+
+
+class CatalogCache(object):
+    """
+    Process wide cache of `LanguageCatalog` objects.
+
+    Entries are dropped by the `Function`/`Keyword` signal handlers in `core.signals`. Other worker
+    processes do not receive those signals, so entries also expire after `GENERATOR_CATALOG_TTL` seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._catalogs = {}
+        self._revisions = {}
+        self._generation = 0
+
+    @property
+    def ttl(self):
+        return getattr(settings, "GENERATOR_CATALOG_TTL", 300)
+
+    def _is_fresh(self, catalog):
+        return self.ttl is None or time.monotonic() - catalog.loaded_at < self.ttl
+
+    def get(self, language):
+        catalog = self._catalogs.get(language.pk)
+        if catalog is not None and self._is_fresh(catalog):
+            return catalog
+
+        with self._lock:
+            revision = self._revision(language.pk)
+        catalog = LanguageCatalog.load(language)
+        with self._lock:
+            # A concurrent invalidation means the rows we just read may already be stale.
+            if self._revision(language.pk) == revision:
+                self._catalogs[language.pk] = catalog
+        return catalog
+
+    def _revision(self, language_id):
+        return self._generation, self._revisions.get(language_id, 0)
+
+    def invalidate(self, language_id=None):
+        with self._lock:
+            if language_id is None:
+                self._generation += 1
+                self._catalogs.clear()
+            else:
+                self._revisions[language_id] = self._revisions.get(language_id, 0) + 1
+                self._catalogs.pop(language_id, None)
+
+
+catalogs = CatalogCache()
@@ -0,0 +1,75 @@
+import re
+from functools import lru_cache
+
+
+PLACEHOLDER = re.compile(r"%\((?P<name>\w+)\)s|%%")
+
+
+def indent_lines(text, indent):
+    if not indent:
+        return text
+    prefix = " " * indent
+    return "\n".join(prefix + line for line in text.split("\n"))
+
+
+def unescape_braces(text):
+    return text.replace("{{", "{").replace("}}", "}")
+
+
+class CompiledTemplate(object):
+    """
+    A `%(name)s` template split once into literal chunks and named slots.
+
+    Rendering appends the chunks and the slot values to an output list, so nested templates are
+    joined a single time by whoever owns the list. A slot value may itself be a list of parts.
+    """
+
+    __slots__ = ("chunks",)
+
+    def __init__(self, chunks):
+        self.chunks = tuple(chunks)
+
+    @classmethod
+    def compile(cls, source, literal=False):
+        if literal:
+            return cls([(source, None)])
+
+        chunks = []
+        text = []
+        position = 0
+        for match in PLACEHOLDER.finditer(source):
+            text.append(source[position:match.start()])
+            position = match.end()
+            if match.group("name") is None:
+                text.append("%")
+                continue
+            chunks.append((unescape_braces("".join(text)), match.group("name")))
+            text = []
+        text.append(source[position:])
+        chunks.append((unescape_braces("".join(text)), None))
+        return cls(chunks)
+
+    @property
+    def slots(self):
+        return [name for _, name in self.chunks if name is not None]
+
+    def render_into(self, parts, context=None):
+        for text, name in self.chunks:
+            if text:
+                parts.append(text)
+            if name is None:
+                continue
+            value = context[name]
+            if isinstance(value, list):
+                parts.extend(value)
+            else:
+                parts.append(value if isinstance(value, str) else str(value))
+        return parts
+
+    def render(self, context=None):
+        return "".join(self.render_into([], context))
+
+
+@lru_cache(maxsize=4096)
+def compile_template(source, literal=False):
+    return CompiledTemplate.compile(source, literal)
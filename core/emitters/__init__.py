@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+# Language name -> emitter class path; a module is only imported when its language is first generated.
+# GENERATOR_EMITTERS in settings adds languages or replaces the built-in emitters.
+EMITTERS = {
+    "Python": "core.emitters.python.PythonEmitter",
+    "C++": "core.emitters.cpp.CppEmitter",
+    "C#": "core.emitters.csharp.CSharpEmitter",
+    "Java": "core.emitters.java.JavaEmitter",
+    "TypeScript": "core.emitters.typescript.TypeScriptEmitter",
+    "Kotlin": "core.emitters.kotlin.KotlinEmitter",
+    "Go": "core.emitters.go.GoEmitter",
+}
+DEFAULT = "Python"
+
+_loaded = {}
+
+
+def registry():
+    emitters = dict(EMITTERS)
+    emitters.update(getattr(settings, "GENERATOR_EMITTERS", {}))
+    return emitters
+
+
+def find(language_name):
+    """The emitter class registered for `language_name`, or None."""
+    path = registry().get(language_name)
+    if path is None:
+        return None
+    emitter = _loaded.get(path)
+    if emitter is None:
+        emitter = _loaded[path] = import_string(path)
+    return emitter
+
+
+def get(language_name):
+    """The emitter class of `language_name`; languages without one are rendered by the Python emitter."""
+    return find(language_name) or find(DEFAULT)
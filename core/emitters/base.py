@@ -0,0 +1,102 @@
+from django.conf import settings
+
+from core.utils import LRUCache
+from .resolution import ResolutionTable
+
+
+fragments = LRUCache(lambda: getattr(settings, "GENERATOR_FRAGMENT_CACHE_SIZE", 20000))
+
+
+class Emitter(object):
+    """
+    Renders the source files of one language from a template snapshot and the language catalog.
+
+    Subclasses implement `generate` (or `iter_files` when the files can be produced one by one). Keyword
+    and function templates of `DEFAULT_KEYWORDS`/`DEFAULT_FUNCTIONS` are used where the database has none.
+    Variables and methods come resolved by the `ResolutionTable` of the language (see `resolution.Field`).
+    """
+
+    BASIC_METHODS = ["__assign__",   # =
+                     "__add__",      # +
+                     "__iadd__",     # +=
+                     "__sub__",      # -
+                     "__isub__",     # -=
+                     "__mul__",      # *
+                     "__imul__",     # *=
+                     "__truediv__",  # /
+                     "__idiv__",     # /=
+                     "__lt__",       # <
+                     "__le__",       # <=
+                     "__gt__",       # >
+                     "__ge__",       # >=
+                     "__ne__",       # !=
+                     "__eq__",       # ==
+                     "__pr_a__",     # Prefix++
+                     "__pf_a__",     # ++Postfix
+                     "__pr_s__",     # Prefix--
+                     "__pf_s__"      # --Postfix
+                     ]
+
+    INDENT = 2
+    # Pygments lexer alias of the highlighted output
+    LEXER = "text"
+    DEFAULT_KEYWORDS = {}
+    DEFAULT_FUNCTIONS = {}
+    # Spelling of list[T], map[K, V] and T? types; BOXED replaces primitives used as type arguments
+    LIST_TYPE = "list[{}]"
+    MAP_TYPE = "dict[{}, {}]"
+    NULLABLE_TYPE = "{}"
+    BOXED = {}
+
+    @classmethod
+    def null_assertion(cls, obj):
+        assert obj is not None, "Object is Null"
+
+    def __init__(self, snapshot, catalog):
+        self.snapshot = snapshot
+        self.catalog = catalog
+        self.table = ResolutionTable.get(type(self), catalog)
+        self.indent = self.table.indent
+        self.variables = [self.table.variable(v) for v in snapshot.variables]
+        self.methods = [self.table.method(func) for func in snapshot.methods]
+        self.keywords = catalog.keywords
+        self.functions = catalog.functions
+        self.class_name = snapshot.name
+        self.basic_functions = catalog.templates(["__init__", "__del__"])
+
+    def generate_basic_functions(self, context=None):
+        code = []
+        for idx, f in enumerate(self.catalog.templates(self.BASIC_METHODS)):
+            if idx:
+                code.append("\n")
+            func = self.catalog.function_template(f.value, self.INDENT, literal=context is None)
+            func.render_into(code, context)
+            code.append("\n")
+
+        return code
+
+    def generate_base(self):
+        self.null_assertion(self.keywords.get("__class__"))
+        return self.catalog.keyword_template("__class__")
+
+    def join_members(self, members):
+        if not members:
+            return []
+        indent = self.indent[1]
+        parts = ["\n", indent]
+        for idx, member in enumerate(members):
+            if idx:
+                parts.append("\n\n" + indent)
+            parts.append(member)
+        return parts
+
+    def fragment(self, kind, inputs, render, *args):
+        """Renders one member fragment (a field, accessor, parameter...), memoized by everything it depends on."""
+        return fragments.get_or_set((self.catalog.version, self.INDENT, kind) + inputs, render, *args)
+
+    def generate(self):
+        """Returns every file as a `{"name", "content"}` dict."""
+        raise NotImplementedError
+
+    def iter_files(self):
+        return iter(self.generate())
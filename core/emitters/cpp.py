@@ -0,0 +1,136 @@
+from .base import Emitter
+
+
+class CppEmitter(Emitter):
+    """Produces main.cpp, the header and the source file, each one rendered when it is requested."""
+
+    LEXER = "cpp"
+    LIST_TYPE = "std::vector<{}>"
+    MAP_TYPE = "std::map<{}, {}>"
+    NULLABLE_TYPE = "std::optional<{}>"
+    # Standard headers of the types above, included by the header file when a member uses them
+    TYPE_HEADERS = (("std::vector<", "vector"), ("std::map<", "map"), ("std::optional<", "optional"))
+
+    def render_source(self, cppVersion="", body=";"):
+        indent = self.indent[1]
+
+        def field(v):
+            return "{}{} {};\n".format(indent, v.type, v.name)
+
+        def param(v):
+            return "{} {}".format(v.type, v.name)
+
+        def assignment(v):
+            return "{0}this->{1}={1};".format(self.indent[2], v.name)
+
+        def getter(var):
+            return self.catalog.function_template("__getattr__").render({
+                "variable_type": var.type,
+                "cppVersion": cppVersion,
+                "body": body if not cppVersion else "{\n%s\n}" % "{}return {};".format(self.indent[2], var.name),
+                "variable_cap": var.cap,
+                "variable_pascal": var.pascal,
+                "variable": var.name
+            })
+
+        def setter(var):
+            return self.catalog.function_template("__setattr__").render({
+                "variable_type": var.type,
+                "cppVersion": cppVersion,
+                "body": body if not cppVersion else "{\n%s\n}" % "{0}this->{1} = {1};".format(self.indent[2], var.name),
+                "variable_cap": var.cap,
+                "variable_pascal": var.pascal,
+                "variable": var.name
+            })
+
+        def method(func):
+            return self.catalog.keyword_template("__function__").render({
+                "f_type": func.type,
+                "name": func.name,
+                "cppVersion": cppVersion, "body": body
+            })
+
+        def get_variables():
+            return ["\n"] + [self.fragment("cpp-field", (v.name, v.v_type), field, v) for v in self.variables]
+
+        def get_includes():
+            if cppVersion:
+                return '#include "{}.h"\n\n'.format(self.class_name)
+
+            includes = ["iostream", "iomanip", "string"]
+            types = [v.type for v in self.variables] + [func.type for func in self.methods]
+            includes += [header for prefix, header in self.TYPE_HEADERS if any(prefix in t for t in types)]
+            includes = "\n".join(["#include <{}>".format(x) for x in includes])
+            includes += "\n\nusing namespace std;\n\n"
+            includes = "#ifndef {name}_H\n#define {name}_H\n\n".format(name=self.class_name) + includes
+            return includes
+
+        def get_basic_part():
+            func_s = ["  public:\n" if not cppVersion else ""]
+            for f in self.basic_functions:
+                template = self.catalog.function_template(f.value)
+                if f.value == "__init__":
+                    func_s.append(template.render({"class_name": self.class_name, "cppVersion": cppVersion,
+                                                   "body": " {\n\n  }" if cppVersion else body, "params": ""}))
+                    func_s.append(template.render({
+                        "class_name": self.class_name, "cppVersion": cppVersion,
+                        "body": " {\n\n  }" if cppVersion else body,
+                        "params": "const {}& object".format(self.class_name)}))
+                    assignments = [self.fragment("cpp-assign", (v.name,), assignment, v)
+                                   for v in self.variables] if cppVersion else []
+                    func_s.append(template.render({
+                        "class_name": self.class_name, "cppVersion": cppVersion,
+                        "body": "{\n%s\n  }" % "\n".join(assignments) if cppVersion else body,
+                        "params": ", ".join(self.fragment("cpp-param", (v.name, v.v_type), param, v)
+                                            for v in self.variables)}))
+                else:
+                    func_s.append(template.render({"class_name": self.class_name, "cppVersion": cppVersion,
+                                                   "body": body}))
+            return "\n{}".format(indent).join(func_s) + "\n\n"
+
+        def get_getter_and_setters():
+            result = []
+            for var in self.variables:
+                inputs = (cppVersion, body, var.name, var.v_type)
+                result.append(self.fragment("cpp-getter", inputs, getter, var))
+                result.append(self.fragment("cpp-setter", inputs, setter, var))
+            return self.join_members(result)
+
+        def add_custom_functions():
+            return self.join_members([self.fragment("cpp-method", (cppVersion, body, func.name, func.f_type),
+                                                    method, func) for func in self.methods])
+
+        basic_func = [get_basic_part()]
+        basic_func += self.generate_basic_functions({"class_name": self.class_name, "body": body,
+                                                     "cppVersion": cppVersion})
+        basic_func += ["\n"] + get_getter_and_setters() + ["\n"] + add_custom_functions()
+
+        template = [get_includes()]
+        if cppVersion:
+            template += ["\n"] + basic_func + ["\n"]
+        else:
+            self.generate_base().render_into(template, {"name": self.class_name, "code": basic_func,
+                                                        "variables": get_variables()})
+            template.append("\n\n#endif // {}_H".format(self.class_name))
+        return "".join(template)
+
+    def iter_files(self):
+        main = """
+#include <iostream>
+#include "%(class_name)s.h"
+
+using namespace std;
+
+int main(){
+   std::cout << "Hello World" << std::endl; 
+   %(class_name)s *instance = new %(class_name)s();
+   return 0;
+}
+""" % {"class_name": self.class_name}
+        yield {"name": "main.cpp", "content": main}
+        yield {"name": "{}.h".format(self.class_name), "content": self.render_source()}
+        yield {"name": "{}.cpp".format(self.class_name), "content": self.render_source(
+            cppVersion="{}::".format(self.class_name), body="{\n%s return; \n}" % self.indent[2])}
+
+    def generate(self):
+        return list(self.iter_files())
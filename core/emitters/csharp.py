@@ -0,0 +1,57 @@
+from .base import Emitter
+
+
+class CSharpEmitter(Emitter):
+
+    LEXER = "csharp"
+    LIST_TYPE = "System.Collections.Generic.List<{}>"
+    MAP_TYPE = "System.Collections.Generic.Dictionary<{}, {}>"
+    NULLABLE_TYPE = "{}?"
+
+    def generate(self):
+        indent = self.indent[1]
+
+        def field(v):
+            return "{}public {} {} {{ get; set; }}\n".format(indent, v.type, v.name)
+
+        def param(v):
+            return "{} {}".format(v.type, v.lower)
+
+        def assignment(x):
+            return "{0}{1} = {2};".format(self.indent[2], x.name, x.lower)
+
+        def method(func):
+            return self.catalog.keyword_template("__function__").render({
+                "f_type": func.type,
+                "name": func.name
+            })
+
+        def get_variables():
+            variables = ["\n"] + [self.fragment("cs-field", (v.name, v.v_type), field, v) for v in self.variables]
+            variables.append("\n")
+            return variables
+
+        def get_basic():
+            func_s = []
+            for f in self.basic_functions:
+                template = self.catalog.function_template(f.value)
+                if f.value == "__init__":
+                    code = [self.fragment("cs-assign", (x.name,), assignment, x) for x in self.variables]
+                    params = ", ".join(self.fragment("cs-param", (v.name, v.v_type), param, v) for v in self.variables)
+
+                    func_s.append(template.render({"class_name": self.class_name, "params": params,
+                                                   "code": "\n".join(code)}))
+                else:
+                    func_s.append(template.render({"class_name": self.class_name}))
+
+            return ["\n", "\n".join(func_s), "\n"]
+
+        def add_custom_functions():
+            return self.join_members([self.fragment("cs-method", (func.name, func.f_type), method, func)
+                                      for func in self.methods])
+
+        code = get_basic() + get_variables()
+        code += self.generate_basic_functions({"class_name": self.class_name})
+        code += ["\n"] + add_custom_functions() + ["\n"]
+        template = self.generate_base().render({"name": self.class_name, "code": code, "variables": ""})
+        return [{"name": "%s.cs" % self.class_name, "content": template}]
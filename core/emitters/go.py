@@ -0,0 +1,59 @@
+from .base import Emitter
+
+
+class GoEmitter(Emitter):
+
+    INDENT = 4
+    LEXER = "go"
+    LIST_TYPE = "[]{}"
+    MAP_TYPE = "map[{}]{}"
+    NULLABLE_TYPE = "*{}"
+
+    DEFAULT_KEYWORDS = {
+        "int": "int",
+        "float": "float64",
+        "str": "string",
+        "bool": "bool",
+        "__class__": "package main\n\ntype %(name)s struct {{\n%(variables)s}}\n%(code)s",
+        "__function__": "func (o *%(class_name)s) %(name)s() %(f_type)s {{\n    panic(\"not implemented\")\n}}"
+    }
+    DEFAULT_FUNCTIONS = {
+        "__init__": "func New%(class_name)s(%(params)s) *%(class_name)s {{\n    return &%(class_name)s{{%(code)s}}\n}}",
+        "__eq__": "func (o *%(class_name)s) Equals(other *%(class_name)s) bool {{\n    return o == other\n}}"
+    }
+
+    def generate(self):
+        indent = self.indent[1]
+
+        def field(v):
+            return "{}{} {}\n".format(indent, v.name, v.type)
+
+        def param(v):
+            return "{} {}".format(v.name, v.type)
+
+        def method(func):
+            return self.catalog.keyword_template("__function__").render({
+                "class_name": self.class_name,
+                "f_type": func.type,
+                "name": func.name
+            })
+
+        def get_constructor():
+            return self.catalog.function_template("__init__").render({
+                "class_name": self.class_name,
+                "params": ", ".join(self.fragment("go-param", (v.name, v.v_type), param, v) for v in self.variables),
+                "code": ", ".join("{0}: {0}".format(v.name) for v in self.variables)
+            })
+
+        code = ["\n", get_constructor(), "\n"]
+        for f in self.catalog.templates(self.BASIC_METHODS):
+            code.append("\n")
+            self.catalog.function_template(f.value).render_into(code, {"class_name": self.class_name})
+            code.append("\n")
+        for func in self.methods:
+            code += ["\n", self.fragment("go-method", (self.class_name, func.name, func.f_type), method, func), "\n"]
+        template = self.generate_base().render({
+            "name": self.class_name, "code": code,
+            "variables": [self.fragment("go-field", (v.name, v.v_type), field, v) for v in self.variables]
+        })
+        return [{"name": "%s.go" % self.class_name.lower(), "content": template}]
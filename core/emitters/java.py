@@ -0,0 +1,87 @@
+from .base import Emitter
+
+
+class JavaEmitter(Emitter):
+
+    LEXER = "java"
+    LIST_TYPE = "java.util.List<{}>"
+    MAP_TYPE = "java.util.Map<{}, {}>"
+    BOXED = {"int": "Integer", "long": "Long", "float": "Float", "double": "Double", "boolean": "Boolean",
+             "char": "Character", "byte": "Byte", "short": "Short"}
+
+    def generate(self):
+        indent = self.indent[1]
+
+        def field(v):
+            return "{}private {} {};\n".format(indent, v.type, v.name)
+
+        def param(v):
+            return "{} {}".format(v.type, v.lower)
+
+        def assignment(x):
+            return "{0}{1} = {2};".format(self.indent[2], x.name, x.lower)
+
+        def accessor(value, var):
+            return self.catalog.function_template(value).render({
+                "variable_type": var.type,
+                "variable_cap": var.cap,
+                "variable_pascal": var.pascal,
+                "variable": var.name
+            })
+
+        def method(func):
+            return self.catalog.keyword_template("__function__").render({
+                "f_type": func.type,
+                "name": func.name
+            })
+
+        def argument(v):
+            if not v.v_type.lower().startswith("str"):
+                return "%s" % (v.default or 'null')
+            return '"%s"' % (v.default or 'String')
+
+        def get_variables():
+            variables = ["\n"] + [self.fragment("java-field", (v.name, v.v_type), field, v) for v in self.variables]
+            variables.append("\n")
+            return variables
+
+        def get_basic():
+            f = self.catalog.get_function("__init__")
+            self.null_assertion(f)
+            code = [self.fragment("java-assign", (x.name,), assignment, x) for x in self.variables[::-1]]
+            params = ", ".join(self.fragment("java-param", (v.name, v.v_type), param, v)
+                               for v in self.variables[::-1])
+
+            return ["\n", self.catalog.function_template(f.value).render({
+                "class_name": self.class_name, "params": params, "code": "\n".join(code)}), "\n"]
+
+        def add_custom_functions():
+            return self.join_members([self.fragment("java-method", (func.name, func.f_type), method, func)
+                                      for func in self.methods])
+
+        def get_getter_and_setters():
+            result = []
+            for var in self.variables:
+                inputs = (var.name, var.v_type)
+                result.append(self.fragment("java-getter", inputs, accessor, "__getattr__", var))
+                result.append(self.fragment("java-setter", inputs, accessor, "__setattr__", var))
+            return self.join_members(result)
+
+        def add_main():
+            params = ", ".join(self.fragment("java-argument", (v.v_type, v.default), argument, v)
+                               for v in self.variables[::-1])
+            main = """
+
+  public static void main(String []args) {
+    %(class)s my%(class_cap)s = new %(class)s(%(params)s);
+  }
+
+"""
+            return main % {"class": self.class_name, "params": params,
+                           "class_cap": self.class_name.lower().capitalize()}
+
+        code = get_basic() + get_variables() + get_getter_and_setters()
+        code += self.generate_basic_functions({"class_name": self.class_name})
+        code += ["\n"] + add_custom_functions() + [add_main(), "\n"]
+        template = self.generate_base().render({"name": self.class_name, "code": code, "variables": ""})
+        return [{"name": "%s.java" % self.class_name, "content": template}]
@@ -0,0 +1,60 @@
+from .base import Emitter
+
+
+class KotlinEmitter(Emitter):
+
+    INDENT = 4
+    LEXER = "kotlin"
+    LIST_TYPE = "List<{}>"
+    MAP_TYPE = "Map<{}, {}>"
+    NULLABLE_TYPE = "{}?"
+    # Default value of a list, map or nullable parameter
+    EMPTY = {"list": "emptyList()", "map": "emptyMap()", "nullable": "null"}
+
+    DEFAULT_KEYWORDS = {
+        "int": "Int",
+        "float": "Double",
+        "str": "String",
+        "bool": "Boolean",
+        "__class__": "class %(name)s(%(variables)s) {{\n%(code)s\n}}\n",
+        "__function__": "fun %(name)s(): %(f_type)s {{\n    TODO(\"Not implemented\")\n}}"
+    }
+    DEFAULT_FUNCTIONS = {
+        "__eq__": "override fun equals(other: Any?): Boolean = this === other",
+        "__add__": "operator fun plus(other: %(class_name)s): %(class_name)s = this",
+        "__sub__": "operator fun minus(other: %(class_name)s): %(class_name)s = this"
+    }
+
+    def generate(self):
+        indent = self.indent[1]
+
+        def param(v):
+            return "{}var {}: {} = {}".format(indent, v.name, v.type, default(v))
+
+        def default(v):
+            if v.kind != "scalar":
+                return v.default or self.EMPTY[v.kind]
+            if v.v_type == "str":
+                return '"%s"' % (v.default or "")
+            if v.v_type == "bool":
+                return "true" if (v.default or "").lower() in ("1", "true") else "false"
+            if v.v_type == "float":
+                return v.default or "0.0"
+            return v.default or "0"
+
+        def method(func):
+            return self.catalog.keyword_template("__function__", self.INDENT).render({
+                "f_type": func.type,
+                "name": func.name
+            })
+
+        variables = ",\n".join(self.fragment("kt-param", (v.name, v.v_type, v.default), param, v)
+                               for v in self.variables)
+        members = [self.catalog.function_template(f.value, self.INDENT).render({"class_name": self.class_name})
+                   for f in self.catalog.templates(self.BASIC_METHODS)]
+        members += [self.fragment("kt-method", (func.name, func.f_type), method, func) for func in self.methods]
+        template = self.generate_base().render({
+            "name": self.class_name, "code": "\n\n".join(members),
+            "variables": "\n{}\n".format(variables) if variables else ""
+        })
+        return [{"name": "%s.kt" % self.class_name, "content": template}]
@@ -0,0 +1,38 @@
+from .base import Emitter
+
+
+class PythonEmitter(Emitter):
+
+    INDENT = 4
+    LEXER = "python"
+
+    def generate(self):
+        indent = self.indent[1]
+
+        def init_line(x):
+            return "{0}{0}self.{1} = kwargs.get('{1}', {2})".format(
+                indent, x.name, (x.default or "None") if x.v_type != "str" else "'%s'" % (x.default or "None"))
+
+        def get_basic():
+            func_s = []
+            for f in self.basic_functions:
+                func_s.extend(indent + x for x in f.template.split("\n"))
+                if f.value == "__init__":
+                    func_s.extend(self.fragment("py-init", (x.name, x.v_type, x.default), init_line, x)
+                                  for x in self.variables)
+
+            return ["\n", "\n\n".join(func_s), "\n\n"]
+
+        def add_custom_funcs():
+            result = []
+            function = self.catalog.keyword_template("__function__", self.INDENT) if self.methods else None
+            for idx, func in enumerate(self.methods):
+                if idx:
+                    result.append("\n\n")
+                result.append(self.fragment("py-method", (func.name,), function.render, {"name": func.name}))
+
+            return result
+
+        code = get_basic() + self.generate_basic_functions() + ["\n"] + add_custom_funcs() + ["\n"]
+        template = self.generate_base().render({"name": self.class_name, "code": code, "variables": ""})
+        return [{"content": template, "name": "%s.py" % self.class_name}]
@@ -0,0 +1,98 @@
+import re
+from collections import namedtuple
+
+from django.conf import settings
+
+from core.utils import LRUCache
+
+
+Type = namedtuple("Type", ["name", "kind"])
+# A snapshot variable or method with everything the emitters derive from it; extends `Variable`/`Method`
+Field = namedtuple("Field", ["name", "v_type", "default", "type", "kind", "lower", "cap", "pascal", "camel"])
+Signature = namedtuple("Signature", ["name", "f_type", "params", "type", "kind"])
+
+GENERIC = re.compile(r"^\s*(list|map|dict)\s*\[(.*)\]\s*$")
+
+tables = LRUCache(64)
+
+
+def split_arguments(arguments):
+    """Splits "str, list[int]" on the commas outside of brackets."""
+    parts, depth, start = [], 0, 0
+    for idx, char in enumerate(arguments):
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == "," and not depth:
+            parts.append(arguments[start:idx])
+            start = idx + 1
+    parts.append(arguments[start:])
+    return [x.strip() for x in parts]
+
+
+def pascal_case(name):
+    return "".join(word[:1].upper() + word[1:] for word in name.split("_") if word)
+
+
+def camel_case(name):
+    name = pascal_case(name)
+    return name[:1].lower() + name[1:]
+
+
+class ResolutionTable(object):
+    """
+    Everything an emitter derives from member types and names, computed once per emitter class and
+    catalog version: indentation strings, resolved types and the name variants of every member.
+
+    Besides the catalog keywords (`int`, `str`...) types may be written as `list[T]`, `map[K, V]`
+    (or `dict[K, V]`) and `T?` for a nullable T, nested as needed; the emitter's LIST_TYPE, MAP_TYPE
+    and NULLABLE_TYPE spell them and BOXED replaces the type arguments that cannot be primitives.
+    A type defined as a keyword is never parsed, so a catalog can spell any of them itself.
+    """
+
+    def __init__(self, emitter, catalog):
+        self.emitter = emitter
+        self.keywords = catalog.keywords
+        self.indent = tuple(" " * (emitter.INDENT * level) for level in range(4))
+        self._cache = LRUCache(lambda: getattr(settings, "GENERATOR_FRAGMENT_CACHE_SIZE", 20000))
+
+    @classmethod
+    def get(cls, emitter, catalog):
+        return tables.get_or_set((emitter, catalog.version), cls, emitter, catalog)
+
+    def resolve(self, type_name):
+        return self._cache.get_or_set(("type", type_name), self._resolve, type_name)
+
+    def argument(self, type_name):
+        name = self.resolve(type_name).name
+        return self.emitter.BOXED.get(name, name)
+
+    def _resolve(self, type_name):
+        if type_name in self.keywords:
+            return Type(self.keywords[type_name], "scalar")
+        if type_name.endswith("?") and type_name.strip() != "?":
+            return Type(self.emitter.NULLABLE_TYPE.format(self.argument(type_name[:-1].strip())), "nullable")
+        match = GENERIC.match(type_name)
+        if match:
+            arguments = split_arguments(match.group(2))
+            if match.group(1) == "list" and len(arguments) == 1 and all(arguments):
+                return Type(self.emitter.LIST_TYPE.format(self.argument(arguments[0])), "list")
+            if match.group(1) != "list" and len(arguments) == 2 and all(arguments):
+                return Type(self.emitter.MAP_TYPE.format(*map(self.argument, arguments)), "map")
+        return Type(type_name, "scalar")
+
+    def variable(self, v):
+        return self._cache.get_or_set(("variable",) + tuple(v), self._variable, v)
+
+    def _variable(self, v):
+        resolved = self.resolve(v.v_type)
+        return Field(v.name, v.v_type, v.default, resolved.name, resolved.kind, v.name.lower(),
+                     v.name.lower().capitalize(), pascal_case(v.name), camel_case(v.name))
+
+    def method(self, func):
+        return self._cache.get_or_set(("method",) + tuple(func), self._method, func)
+
+    def _method(self, func):
+        resolved = self.resolve(func.f_type)
+        return Signature(func.name, func.f_type, func.params, resolved.name, resolved.kind)
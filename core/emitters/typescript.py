@@ -0,0 +1,70 @@
+from .base import Emitter
+
+
+class TypeScriptEmitter(Emitter):
+
+    INDENT = 4
+    LEXER = "typescript"
+    LIST_TYPE = "Array<{}>"
+    MAP_TYPE = "Map<{}, {}>"
+    NULLABLE_TYPE = "{} | null"
+    # Default value of a list, map or nullable parameter
+    EMPTY = {"list": "[]", "map": "new Map()", "nullable": "null"}
+
+    DEFAULT_KEYWORDS = {
+        "int": "number",
+        "float": "number",
+        "str": "string",
+        "bool": "boolean",
+        "__class__": "export class %(name)s {{\n%(code)s\n}}\n",
+        "__function__": "public %(name)s(): %(f_type)s {{\n    throw new Error(\"Not implemented\");\n}}"
+    }
+    DEFAULT_FUNCTIONS = {
+        "__init__": "    constructor(%(params)s) {{\n%(code)s\n    }}",
+        "__eq__": "public equals(other: %(class_name)s): boolean {{\n    return this === other;\n}}"
+    }
+
+    def generate(self):
+        indent = self.indent[1]
+
+        def field(v):
+            return "{}public {}: {};".format(indent, v.name, v.type)
+
+        def param(v):
+            return "{}: {} = {}".format(v.name, v.type, default(v))
+
+        def assignment(v):
+            return "{}this.{} = {};".format(self.indent[2], v.name, v.name)
+
+        def default(v):
+            if v.kind != "scalar":
+                return v.default or self.EMPTY[v.kind]
+            if v.v_type == "str":
+                return '"%s"' % (v.default or "")
+            if v.v_type == "bool":
+                return "true" if (v.default or "").lower() in ("1", "true") else "false"
+            return v.default or "0"
+
+        def method(func):
+            return self.catalog.keyword_template("__function__", self.INDENT).render({
+                "f_type": func.type,
+                "name": func.name
+            })
+
+        def get_constructor():
+            params = ", ".join(self.fragment("ts-param", (v.name, v.v_type, v.default), param, v)
+                               for v in self.variables)
+            code = "\n".join(self.fragment("ts-assign", (v.name,), assignment, v) for v in self.variables)
+            return self.catalog.function_template("__init__").render({"params": params, "code": code})
+
+        code = [self.fragment("ts-field", (v.name, v.v_type), field, v) + "\n" for v in self.variables]
+        if self.variables:
+            code.append("\n")
+        code.append(get_constructor())
+        for f in self.catalog.templates(self.BASIC_METHODS):
+            code.append("\n\n")
+            self.catalog.function_template(f.value, self.INDENT).render_into(code, {"class_name": self.class_name})
+        for func in self.methods:
+            code += ["\n\n", self.fragment("ts-method", (func.name, func.f_type), method, func)]
+        template = self.generate_base().render({"name": self.class_name, "code": code})
+        return [{"name": "%s.ts" % self.class_name, "content": template}]
@@ -0,0 +1,53 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+
+
+def run_job(job):
+    """Worker entry point: builds (or loads) the artifact of a `(snapshot, catalog)` pair without the ORM."""
+    if not apps.ready:
+        django.setup()
+    from .generator import CodeGenerator
+
+    snapshot, catalog = job
+    return CodeGenerator(snapshot, catalog=catalog).get_artifact()
+
+
+class GenerationExecutor(object):
+    """
+    Runs generation jobs on a pool of worker processes and returns the artifacts in job order.
+
+    Jobs carry the template snapshot together with its language catalog, so workers only render,
+    highlight and write to storage. With a single worker jobs run in the calling process.
+    """
+
+    def __init__(self, workers=None):
+        if workers is None:
+            workers = getattr(settings, "GENERATOR_WORKERS", None) or os.cpu_count() or 1
+        self.workers = workers
+        self.pool = None
+
+    def __enter__(self):
+        if self.workers > 1:
+            # Forked workers must not share the parent's database connections. The pool forks on the first
+            # submit, so the workers are started right away, before the caller reopens a connection
+            connections.close_all()
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            self.pool.submit(os.getpid).result()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def map(self, jobs):
+        jobs = list(jobs)
+        if self.pool is None:
+            return [run_job(job) for job in jobs]
+        chunksize = max(1, len(jobs) // (self.workers * 4))
+        return list(self.pool.map(run_job, jobs, chunksize=chunksize))
@@ -0,0 +1,152 @@
+import os
+import posixpath
+from collections import Counter
+from datetime import timedelta
+
+from django.utils import timezone
+
+from . import jobs
+from .artifacts import artifacts
+from .models import CodeTemplate, GenerationJob
+
+
+LEGACY_ROOT = "files"
+
+
+class Collector(object):
+    """
+    Mark and sweep of the artifact storage. An artifact is live while a template's `created_file` is
+    its archive or a finished job that has not expired (see `jobs.expired`) refers to it; a blob is
+    live while a live manifest lists it. The references are counted across templates rather than
+    stored, so nothing has to be kept in step with deletes. Files younger than `min_age` are never
+    swept: they may belong to a generation that has not written its manifest yet. A generation that
+    reuses a blob refreshes its modification time and the manifests written while the collector runs
+    are checked again before every batch. Expired jobs are deleted along with the artifacts.
+    """
+
+    def __init__(self, store=artifacts, min_age=timedelta(hours=24), batch_size=500, dry_run=False):
+        self.store = store
+        self.storage = store.storage
+        self.min_age = min_age
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.stats = Counter()
+        self.started = None
+
+    def walk(self, directory):
+        if not self.storage.exists(directory):
+            return
+        dirs, files = self.storage.listdir(directory)
+        for name in files:
+            yield posixpath.join(directory, name)
+        for name in dirs:
+            yield from self.walk(posixpath.join(directory, name))
+
+    def references(self):
+        """Template count of every file referred to by `created_file`."""
+        files = CodeTemplate.objects.exclude(created_file="").exclude(created_file=None)
+        return Counter(files.values_list("created_file", flat=True).iterator())
+
+    def manifests(self):
+        for directory in self.storage.listdir(self.store.ROOT)[0]:
+            if directory in (self.store.BLOBS, self.store.ARCHIVES):
+                continue
+            for digest in self.storage.listdir(posixpath.join(self.store.ROOT, directory))[0]:
+                yield digest, posixpath.join(self.store.directory(digest), self.store.MANIFEST)
+
+    def old(self, name):
+        return self.storage.get_modified_time(name) < timezone.now() - self.min_age
+
+    def mark(self, references, expired=()):
+        done = GenerationJob.objects.filter(status=GenerationJob.DONE).exclude(artifact="")
+        done = {digest for pk, digest in done.values_list("pk", "artifact").iterator() if pk not in expired}
+        live, dead = set(references), []
+        for digest, manifest in self.manifests():
+            artifact = self.store.load(digest)
+            if artifact is None:
+                continue
+            if digest in done or artifact.archive in references or not self.old(manifest):
+                live.add(artifact.archive)
+                live.update(name for f in artifact.files for name in (f["source"], f["content"]))
+            else:
+                dead.append(manifest)
+        return live, dead
+
+    def orphans(self, live):
+        for directory in (self.store.BLOBS, self.store.ARCHIVES):
+            for name in self.walk(posixpath.join(self.store.ROOT, directory)):
+                if name not in live and self.old(name):
+                    yield name
+        for name in self.walk(LEGACY_ROOT):
+            if name not in live and self.old(name):
+                yield name
+
+    def delete(self, names, kind):
+        batch = []
+        for name in names:
+            batch.append(name)
+            if len(batch) >= self.batch_size:
+                self.sweep(batch, kind)
+                batch = []
+        if batch:
+            self.sweep(batch, kind)
+
+    def recent(self):
+        """Files listed by the manifests written since the collection started."""
+        files = set()
+        if not self.storage.exists(self.store.ROOT):
+            return files
+        for digest, manifest in self.manifests():
+            if self.storage.exists(manifest) and self.storage.get_modified_time(manifest) >= self.started:
+                artifact = self.store.load(digest)
+                if artifact is None:
+                    continue
+                files.add(artifact.archive)
+                files.update(name for f in artifact.files for name in (f["source"], f["content"]))
+        return files
+
+    def sweep(self, batch, kind):
+        if kind == "files":
+            recent = self.recent()
+            batch = [name for name in batch if name not in recent]
+        self.stats[kind] += len(batch)
+        if self.dry_run:
+            return
+        for name in batch:
+            self.storage.delete(name)
+            self.prune(posixpath.dirname(name))
+
+    def prune(self, directory):
+        """Removes the emptied directories of a deleted file, up to the storage root."""
+        try:
+            path = self.storage.path(directory)
+        except NotImplementedError:
+            return
+        while directory and directory not in (self.store.ROOT, LEGACY_ROOT):
+            try:
+                os.rmdir(path)
+            except OSError:
+                return
+            directory, path = posixpath.dirname(directory), os.path.dirname(path)
+
+    def run(self):
+        # A second of slack for file systems that store modification times coarsely
+        self.started = timezone.now() - timedelta(seconds=1)
+        references = self.references()
+        self.stats["templates"] = sum(references.values())
+        self.stats["shared"] = sum(1 for count in references.values() if count > 1)
+        expired = set(jobs.expired(self.min_age).values_list("pk", flat=True).iterator())
+        if not self.storage.exists(self.store.ROOT):
+            live, dead = set(references), []
+        else:
+            live, dead = self.mark(references, expired)
+        self.stats["live"] = len(live)
+        self.stats["jobs"] = len(expired) if self.dry_run else jobs.prune(expired, self.batch_size)
+        # Manifests go first, so the files of an artifact are never swept while it can still be served
+        self.delete(dead, "artifacts")
+        self.delete(self.orphans(live), "files")
+        return self.stats
+
+
+def collect(**options):
+    return Collector(**options).run()
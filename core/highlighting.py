@@ -0,0 +1,88 @@
+import hashlib
+
+from django.conf import settings
+
+from pygments import format as format_tokens, highlight
+from pygments.formatters import get_formatter_by_name
+from pygments.lexers import get_lexer_by_name
+from pygments.util import ClassNotFound
+
+from core.utils import LRUCache
+
+
+class Highlighter(object):
+    """
+    Pygments highlighting with lexers and the formatter created on first use and the resulting
+    HTML memoized by lexer and source hash (least recently used entries are evicted first).
+    """
+
+    def __init__(self, max_entries=None):
+        self._lexers = {}
+        self._cache = LRUCache(max_entries or (lambda: getattr(settings, "GENERATOR_HIGHLIGHT_CACHE_SIZE", 256)))
+        self._formatter = None
+        self._styles = None
+
+    @property
+    def formatter(self):
+        if self._formatter is None:
+            self._formatter = get_formatter_by_name("html", linenos=True)
+        return self._formatter
+
+    @property
+    def styles(self):
+        if self._styles is None:
+            self._styles = "<style>{}</style>".format(self.formatter.get_style_defs(".highlight"))
+        return self._styles
+
+    def lexer(self, alias):
+        lexer = self._lexers.get(alias)
+        if lexer is None:
+            try:
+                lexer = get_lexer_by_name(alias, stripall=True)
+            except ClassNotFound:
+                lexer = get_lexer_by_name("text", stripall=True)
+            self._lexers[alias] = lexer
+        return lexer
+
+    def highlight(self, source, alias):
+        """Highlights `source` with the Pygments lexer `alias` (an emitter's `LEXER`), plain text when unknown."""
+        key = (alias, hashlib.sha1(source.encode("utf-8")).hexdigest())
+        return self._cache.get_or_set(key, highlight, source, self.lexer(alias), self.formatter)
+
+    @staticmethod
+    def line_count(source):
+        # The lexers strip the source (`stripall`) before numbering its lines
+        return source.strip().count("\n") + 1
+
+    def tokenize(self, source, alias):
+        """The tokens of `source` split into lines; a token spanning several lines is cut at every newline."""
+        lines, line = [], []
+        for ttype, value in self.lexer(alias).get_tokens(source):
+            parts = value.split("\n")
+            for part in parts[:-1]:
+                if part:
+                    line.append((ttype, part))
+                line.append((ttype, "\n"))
+                lines.append(line)
+                line = []
+            if parts[-1]:
+                line.append((ttype, parts[-1]))
+        if line:
+            lines.append(line)
+        return lines
+
+    def highlight_lines(self, source, alias, start, end):
+        """
+        Highlights lines `start` to `end` (1-based, inclusive) of `source`, numbered as in the whole file.
+        The source is lexed as a whole, so a range never starts in the middle of a comment or a string.
+        """
+        key = ("lines", alias, hashlib.sha1(source.encode("utf-8")).hexdigest())
+        lines = self._cache.get_or_set(key, self.tokenize, source, alias)
+        tokens = [token for line in lines[start - 1:end] for token in line]
+        return format_tokens(tokens, get_formatter_by_name("html", linenos=True, linenostart=start))
+
+    def clear(self):
+        self._cache.clear()
+
+
+highlighter = Highlighter()
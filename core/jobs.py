@@ -0,0 +1,102 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .bulk import generate_fanout
+from .catalog import catalogs
+from .generator import CodeGenerator
+from .models import GenerationJob
+from .snapshot import TemplateSnapshot
+
+
+logger = logging.getLogger(__name__)
+
+ACTIVE = (GenerationJob.PENDING, GenerationJob.RUNNING)
+FINISHED = (GenerationJob.DONE, GenerationJob.FAILED)
+
+
+def enqueue(code_template, fanout=False, delay=None):
+    """
+    Returns the unfinished job of the template, creating one when there is none.
+
+    With `delay` (seconds) the job is debounced: it runs no sooner than `delay` after the last call.
+    A running job is not reused then, since it may have read the template before the change.
+    """
+    if delay is None:
+        job = GenerationJob.objects.filter(template=code_template, fanout=fanout, status__in=ACTIVE)
+        job = job.order_by("-pk").first()
+        if job is not None and job.run_after is not None:
+            # Someone is waiting for the result, a debounced job runs right away
+            GenerationJob.objects.filter(pk=job.pk).update(run_after=None)
+        return job or GenerationJob.objects.create(template=code_template, fanout=fanout)
+
+    run_after = timezone.now() + timedelta(seconds=delay)
+    job = GenerationJob.objects.filter(template=code_template, fanout=fanout, status=GenerationJob.PENDING)
+    job = job.order_by("-pk").first()
+    if job is not None and GenerationJob.objects.filter(pk=job.pk, status=GenerationJob.PENDING).update(
+            run_after=run_after):
+        return job
+    return GenerationJob.objects.create(template=code_template, fanout=fanout, run_after=run_after)
+
+
+def claim_next():
+    """Marks the oldest pending job as running; the conditional UPDATE keeps concurrent workers apart."""
+    candidates = GenerationJob.objects.filter(Q(run_after__isnull=True) | Q(run_after__lte=timezone.now()),
+                                              status=GenerationJob.PENDING).order_by("pk").values_list("pk", flat=True)
+    for pk in candidates[:10]:
+        claimed = GenerationJob.objects.filter(pk=pk, status=GenerationJob.PENDING).update(
+            status=GenerationJob.RUNNING, start_dt=timezone.now())
+        if claimed:
+            return GenerationJob.objects.get(pk=pk)
+    return None
+
+
+def requeue_stale(seconds):
+    """Returns jobs of crashed workers, running for longer than `seconds`, to the queue."""
+    return GenerationJob.objects.filter(
+        status=GenerationJob.RUNNING, start_dt__lt=timezone.now() - timedelta(seconds=seconds)
+    ).update(status=GenerationJob.PENDING, start_dt=None)
+
+
+def expired(age):
+    """
+    Finished and failed jobs older than `age` (a timedelta). The newest finished job of a template
+    (and fanout) never expires: its artifact is the one the template is viewed with.
+    """
+    newest = GenerationJob.objects.filter(status=GenerationJob.DONE).values("template_id", "fanout")
+    newest = newest.annotate(last=Max("pk")).values_list("last", flat=True)
+    return GenerationJob.objects.filter(status__in=FINISHED, finish_dt__lt=timezone.now() - age).exclude(
+        pk__in=newest)
+
+
+def prune(pks, batch_size=500):
+    """Deletes the jobs `pks` in batches; returns their number."""
+    pks = list(pks)
+    for start in range(0, len(pks), batch_size):
+        GenerationJob.objects.filter(pk__in=pks[start:start + batch_size]).delete()
+    return len(pks)
+
+
+def run(job):
+    try:
+        code_template = TemplateSnapshot.queryset().get(pk=job.template_id)
+        # The worker misses the catalog signals of the web processes; a job generated from a stale catalog
+        # would store a digest the enqueuing view never looks up, so the catalogs are reloaded for every job
+        catalogs.invalidate(None if job.fanout else code_template.language_id)
+        if job.fanout:
+            artifact = generate_fanout(code_template)
+        else:
+            generator = CodeGenerator(code_template)
+            artifact = generator.get_artifact()
+            generator.attach(artifact)
+            generator.trace.report()
+        job.status, job.artifact = GenerationJob.DONE, artifact.digest
+    except Exception:
+        logger.exception("Generation job %s failed", job.pk)
+        job.status, job.error = GenerationJob.FAILED, traceback.format_exc()
+    job.finish_dt = timezone.now()
+    job.save(update_fields=["status", "artifact", "error", "finish_dt"])
+    return job
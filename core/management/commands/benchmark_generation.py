@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core import benchmark
+
+
+class Command(BaseCommand):
+    help = ("Benchmarks code generation per stage and language on synthetic templates "
+            "in a throw-away in-memory SQLite database.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1,10,100,1000",
+                            help="Comma separated numbers of fields and methods per template (up to 10000)")
+        parser.add_argument("--language", action="append", dest="languages", default=None)
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per stage, the best time is reported")
+        parser.add_argument("--no-memory", action="store_false", dest="memory", help="Skip peak memory tracing")
+        parser.add_argument("--save", metavar="PATH", help="Write the results as a JSON baseline")
+        parser.add_argument("--compare", metavar="PATH", help="Compare against a saved JSON baseline")
+        parser.add_argument("--threshold", type=float, default=1.25,
+                            help="With --compare, fail when a stage is this many times slower")
+
+    def handle(self, *args, **options):
+        sizes = [int(x) for x in options["sizes"].split(",")]
+        with benchmark.benchmark_database():
+            results = benchmark.Benchmark(sizes, options["languages"], options["repeat"], options["memory"]).run()
+
+        self.stdout.write("{:<10} {:>6} {:<10} {:>10} {:>8} {:>10}".format(
+            "language", "size", "stage", "ms", "queries", "peak KB"))
+        for r in results:
+            self.stdout.write("{:<10} {:>6} {:<10} {:>10.2f} {:>8} {:>10}".format(
+                r.language, r.size, r.stage, r.seconds * 1000, r.queries, r.peak_kb))
+
+        if options["save"]:
+            benchmark.save(results, options["save"])
+
+        errors = ["{} {} {}: {} queries".format(r.language, r.size, r.stage, r.queries)
+                  for r in benchmark.budget_violations(results)]
+        if options["compare"]:
+            for r, previous, ratio in benchmark.compare(results, options["compare"]):
+                if ratio > options["threshold"]:
+                    errors.append("{} {} {}: {:.2f} ms -> {:.2f} ms (x{:.2f})".format(
+                        r.language, r.size, r.stage, previous * 1000, r.seconds * 1000, ratio))
+        if errors:
+            raise CommandError("Benchmark regressions:\n" + "\n".join(errors))
@@ -0,0 +1,24 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand
+
+from core import packs
+
+
+class Command(BaseCommand):
+    help = "Writes the keyword and function templates of the language catalogs as a JSON language pack."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--language", action="append", dest="languages", default=None)
+        parser.add_argument("-o", "--output", metavar="PATH", help="Pack file (standard output by default)")
+
+    def handle(self, *args, **options):
+        pack = packs.export_catalog(options["languages"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(pack, f, ensure_ascii=False, indent=1)
+                f.write("\n")
+        else:
+            json.dump(pack, sys.stdout, ensure_ascii=False, indent=1)
+            self.stdout.write("")
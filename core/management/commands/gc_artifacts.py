@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.gc import collect
+
+
+class Command(BaseCommand):
+    help = ("Deletes stored artifacts no template or recent finished job refers to, the blobs and archives "
+            "only they used, unreferenced legacy files and expired jobs; run it periodically, e.g. from cron.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--min-age", type=float, default=24,
+                            help="Keep files and jobs younger than this many hours")
+        parser.add_argument("--batch-size", type=int, default=500, help="Files deleted per batch")
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be deleted")
+
+    def handle(self, *args, **options):
+        stats = collect(min_age=timedelta(hours=options["min_age"]), batch_size=options["batch_size"],
+                        dry_run=options["dry_run"])
+        if options["verbosity"] > 1:
+            self.stdout.write("{} templates refer to stored files, {} files are shared, {} files are live".format(
+                stats["templates"], stats["shared"], stats["live"]))
+        message = "{} {} artifacts, {} files and {} jobs".format(
+            "Would delete" if options["dry_run"] else "Deleted", stats["artifacts"], stats["files"], stats["jobs"])
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.bulk import BATCH_SIZE, iter_generate_many, pack
+from core.models import CodeTemplate, Language
+
+
+class Command(BaseCommand):
+    help = "Generates code for many templates at once, by ids and/or filters (all templates by default)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("ids", nargs="*", type=int, help="CodeTemplate ids")
+        parser.add_argument("--template-language", action="append", dest="template_languages", default=[],
+                            help="Only templates written for this language (repeatable)")
+        parser.add_argument("--name", help="Only templates whose class name contains this text")
+        parser.add_argument("--since", help="Only templates created on or after this date (YYYY-MM-DD)")
+        parser.add_argument("--language", action="append", dest="languages", default=None,
+                            help="Generate for this language instead of the template's own (repeatable)")
+        parser.add_argument("--combined", metavar="PATH",
+                            help="Also write the sources of all templates into one archive at PATH")
+        parser.add_argument("--no-attach", action="store_false", dest="attach",
+                            help="Do not point CodeTemplate.created_file at the new archives")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Worker processes (default: GENERATOR_WORKERS or the number of CPUs)")
+
+    def get_queryset(self, options):
+        queryset = CodeTemplate.objects.all()
+        if options["ids"]:
+            queryset = queryset.filter(pk__in=options["ids"])
+        if options["template_languages"]:
+            queryset = queryset.filter(language__name__in=options["template_languages"])
+        if options["name"]:
+            queryset = queryset.filter(name__icontains=options["name"])
+        if options["since"]:
+            queryset = queryset.filter(create_dt__date__gte=options["since"])
+        return queryset
+
+    def iter_results(self, options):
+        try:
+            results = iter_generate_many(self.get_queryset(options), options["languages"],
+                                         options["attach"], options["batch_size"], options["workers"])
+            for result in results:
+                self.count += 1
+                if options["verbosity"] > 1:
+                    self.stdout.write("{} {} [{}] -> {}".format(
+                        result.template.pk, result.template.name, result.language.name, result.artifact.archive))
+                yield result
+        except Language.DoesNotExist as e:
+            raise CommandError(e)
+
+    def handle(self, *args, **options):
+        self.count = 0
+        if options["combined"]:
+            with open(options["combined"], "wb") as f:
+                pack(self.iter_results(options), f)
+        else:
+            for _ in self.iter_results(options):
+                pass
+        self.stdout.write(self.style.SUCCESS("Generated {} archives".format(self.count)))
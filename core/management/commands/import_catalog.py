@@ -0,0 +1,25 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import packs
+
+
+class Command(BaseCommand):
+    help = ("Loads JSON language packs (see export_catalog) in one transaction; "
+            "the built-in default pack when none given.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", metavar="PATH")
+        parser.add_argument("--replace", action="store_true",
+                            help="Delete templates of the packed languages that are not in the pack")
+
+    def handle(self, *args, **options):
+        for path in options["paths"] or [packs.DEFAULT_PACK]:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    stats = packs.import_catalog(json.load(f), replace=options["replace"])
+            except (OSError, ValueError) as e:
+                raise CommandError("{}: {}".format(path, e))
+            self.stdout.write("{}: {languages} languages, {created} created, {updated} updated, "
+                              "{deleted} deleted".format(path, **stats))
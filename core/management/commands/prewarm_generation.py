@@ -0,0 +1,27 @@
+from django.db.models import Max
+from django.db.models.functions import Coalesce
+from django.core.management.base import BaseCommand
+
+from core.bulk import iter_generate_many
+from core.models import CodeTemplate
+
+
+class Command(BaseCommand):
+    help = ("Stores the artifacts of the most recently created or generated templates ahead of time, so "
+            "their code pages find them in the storage; run it after a deploy or a catalog change.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=100, help="Number of templates")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Worker processes (default: GENERATOR_WORKERS or the number of CPUs)")
+
+    def handle(self, *args, **options):
+        recent = CodeTemplate.objects.annotate(last_used=Coalesce(Max("jobs__create_dt"), "create_dt"))
+        pks = list(recent.order_by("-last_used").values_list("pk", flat=True)[:options["limit"]])
+        count = 0
+        for result in iter_generate_many(pks, workers=options["workers"]):
+            count += 1
+            if options["verbosity"] > 1:
+                self.stdout.write("{} {} -> {}".format(
+                    result.template.pk, result.template.name, result.artifact.digest))
+        self.stdout.write(self.style.SUCCESS("Prewarmed {} templates".format(count)))
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import jobs
+
+
+class Command(BaseCommand):
+    help = "Runs queued GenerationJobs; the admin enqueues them when GENERATOR_ASYNC is enabled."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+        parser.add_argument("--sleep", type=float, default=1.0, help="Seconds to wait for new jobs")
+        parser.add_argument("--stale-after", type=int, default=600,
+                            help="Requeue jobs that have been running for this many seconds")
+
+    def handle(self, *args, **options):
+        checked = None
+        while True:
+            if checked is None or time.monotonic() - checked > 60:
+                jobs.requeue_stale(options["stale_after"])
+                checked = time.monotonic()
+            job = jobs.claim_next()
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["sleep"])
+                continue
+
+            job = jobs.run(job)
+            if options["verbosity"] > 1:
+                self.stdout.write("{} -> {}".format(job, job.artifact or job.error))
@@ -0,0 +1,197 @@
+import logging
+import threading
+import time
+import traceback
+import warnings
+from collections import deque
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SINKS = ("core.metrics.log_sink", "core.metrics.histogram_sink")
+
+
+class QueryCounter(object):
+    """
+    Takes the place of `connection.queries_log` while queries are counted: keeps their number instead
+    of their SQL and passes them on to the replaced log only when that one was recording anyway.
+    """
+
+    maxlen = None
+
+    def __init__(self, log, forward):
+        self.log = log
+        self.forward = forward
+        self.count = 0
+
+    def append(self, query):
+        self.count += 1
+        if self.forward:
+            self.log.append(query)
+
+    def clear(self):
+        pass
+
+    def __len__(self):
+        return 0
+
+    def __iter__(self):
+        return iter(())
+
+
+@contextmanager
+def count_queries():
+    """Yields a list that receives the number of queries run inside the block once it exits."""
+    result = []
+    counter = QueryCounter(connection.queries_log, connection.queries_logged)
+    force_debug_cursor = connection.force_debug_cursor
+    connection.force_debug_cursor = True
+    connection.queries_log = counter
+    try:
+        yield result
+    finally:
+        connection.queries_log = counter.log
+        connection.force_debug_cursor = force_debug_cursor
+        result.append(counter.count)
+
+
+class Stage(object):
+    __slots__ = ("name", "seconds", "queries")
+
+    def __init__(self, name, seconds, queries):
+        self.name = name
+        self.seconds = seconds
+        self.queries = queries
+
+
+class GenerationTrace(object):
+    """
+    Wall time and database queries per generation stage, handed to the GENERATOR_METRICS_SINKS on `report`.
+
+    A stage entered several times accumulates; stages may nest (storing consumes the files as they are
+    emitted and highlighted) and then each one records its own share without the nested stages.
+    """
+
+    def __init__(self, label=""):
+        self.label = label
+        self.stages = []
+        self._stack = []
+
+    def add(self, name, seconds, queries):
+        for s in self.stages:
+            if s.name == name:
+                s.seconds += seconds
+                s.queries += queries
+                return
+        self.stages.append(Stage(name, seconds, queries))
+
+    @contextmanager
+    def stage(self, name):
+        nested = [0.0, 0]
+        self._stack.append(nested)
+        start = time.perf_counter()
+        try:
+            with count_queries() as queries:
+                yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][0] += seconds
+                self._stack[-1][1] += queries[0]
+            self.add(name, seconds - nested[0], queries[0] - nested[1])
+
+    @property
+    def seconds(self):
+        return sum(s.seconds for s in self.stages)
+
+    @property
+    def queries(self):
+        return sum(s.queries for s in self.stages)
+
+    def server_timing(self):
+        return ", ".join('{};dur={:.1f};desc="{} queries"'.format(s.name, s.seconds * 1000, s.queries)
+                         for s in self.stages)
+
+    def report(self):
+        if not getattr(settings, "GENERATOR_METRICS", True):
+            return
+        for sink in get_sinks():
+            try:
+                sink(self)
+            except Exception:
+                # Not through `logger`: when its handler is what failed, log_sink would fail again
+                warnings.warn("Metrics sink {!r} failed:\n{}".format(sink, traceback.format_exc()), RuntimeWarning)
+
+    def __str__(self):
+        stages = " ".join("{}={:.1f}ms/{}q".format(s.name, s.seconds * 1000, s.queries) for s in self.stages)
+        return "{} {} total={:.1f}ms/{}q".format(self.label, stages, self.seconds * 1000, self.queries)
+
+
+class RollingHistogram(object):
+    """The last `max_entries` durations of every stage, summarized as percentiles for the admin stats page."""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def add(self, trace):
+        with self._lock:
+            for s in trace.stages:
+                samples = self._stages.get(s.name)
+                if samples is None:
+                    samples = self._stages[s.name] = deque(maxlen=self.max_entries)
+                samples.append((s.seconds, s.queries))
+            total = self._stages.setdefault("total", deque(maxlen=self.max_entries))
+            total.append((trace.seconds, trace.queries))
+
+    @staticmethod
+    def percentile(values, fraction):
+        return values[min(len(values) - 1, int(len(values) * fraction))]
+
+    def summary(self):
+        with self._lock:
+            stages = [(name, list(samples)) for name, samples in self._stages.items()]
+        rows = []
+        for name, samples in stages:
+            seconds = sorted(s for s, q in samples)
+            rows.append({
+                "stage": name,
+                "count": len(samples),
+                "mean": sum(seconds) / len(seconds) * 1000,
+                "p50": self.percentile(seconds, 0.5) * 1000,
+                "p95": self.percentile(seconds, 0.95) * 1000,
+                "max": seconds[-1] * 1000,
+                "queries": sum(q for s, q in samples) / len(samples)
+            })
+        return rows
+
+    def clear(self):
+        with self._lock:
+            self._stages.clear()
+
+
+histogram = RollingHistogram()
+_sinks = {}
+
+
+def get_sinks():
+    paths = tuple(getattr(settings, "GENERATOR_METRICS_SINKS", DEFAULT_SINKS))
+    sinks = _sinks.get(paths)
+    if sinks is None:
+        sinks = _sinks[paths] = [import_string(path) for path in paths]
+    return sinks
+
+
+def log_sink(trace):
+    logger.info("%s", trace)
+
+
+def histogram_sink(trace):
+    histogram.add(trace)
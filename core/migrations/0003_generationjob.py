@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_codetemplate_created_file'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GenerationJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fanout', models.BooleanField(default=False, verbose_name='Всі мови')),
+                ('status', models.CharField(choices=[('pending', 'Очікує'), ('running', 'Виконується'), ('done', 'Готово'), ('failed', 'Помилка')], default='pending', max_length=10, verbose_name='Статус')),
+                ('artifact', models.CharField(blank=True, default='', max_length=40, verbose_name='Артефакт')),
+                ('error', models.TextField(blank=True, default='', verbose_name='Помилка')),
+                ('create_dt', models.DateTimeField(auto_now_add=True, verbose_name='Дата створення')),
+                ('start_dt', models.DateTimeField(default=None, null=True, verbose_name='Початок')),
+                ('finish_dt', models.DateTimeField(default=None, null=True, verbose_name='Завершення')),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='jobs', related_query_name='jobs', to='core.CodeTemplate', verbose_name='Шаблон коду')),
+            ],
+            options={
+                'verbose_name': 'Задача генерації',
+                'verbose_name_plural': 'Задачі генерації',
+                'db_table': 'app_generation_job',
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_generationjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='codetemplate',
+            index=models.Index(fields=['create_dt'], name='code_template_create_dt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='codetemplate',
+            index=models.Index(fields=['language', 'create_dt'], name='code_template_lang_dt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='addones',
+            index=models.Index(fields=['template', 'id'], name='add_ones_template_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='funcaddones',
+            index=models.Index(fields=['template', 'id'], name='add_ones_func_template_idx'),
+        ),
+        migrations.AlterField(
+            model_name='addones',
+            name='template',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='add_ones', related_query_name='add_ones', to='core.CodeTemplate', verbose_name='Мова програмування'),
+        ),
+        migrations.AlterField(
+            model_name='funcaddones',
+            name='template',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='add_ones_func', related_query_name='add_ones_func', to='core.CodeTemplate', verbose_name='Мова програмування'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+LANGUAGES = ["TypeScript", "Kotlin", "Go"]
+
+
+def add_languages(apps, schema_editor):
+    Language = apps.get_model("core", "Language")
+    for name in LANGUAGES:
+        Language.objects.using(schema_editor.connection.alias).get_or_create(name=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_template_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_languages, migrations.RunPython.noop),
+    ]
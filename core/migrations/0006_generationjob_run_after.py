@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_add_languages'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generationjob',
+            name='run_after',
+            field=models.DateTimeField(default=None, null=True, verbose_name='Не раніше'),
+        ),
+    ]
@@ -63,6 +63,10 @@ class CodeTemplate(models.Model):
         db_table = "app_code_template"
         verbose_name = "Шаблон коду"
         verbose_name_plural = "Шаблони коду"
+        indexes = [
+            models.Index(fields=["create_dt"], name="code_template_create_dt_idx"),
+            models.Index(fields=["language", "create_dt"], name="code_template_lang_dt_idx"),
+        ]
 
     def __str__(self):
         return "{} => {} [{}]".format(self.language, self.name, self.create_dt.strftime('%Y-%m-%d %H:%M'))
@@ -76,8 +80,8 @@ class AddOnes(models.Model):
         ("bool", "Булеве")
     )
 
-    template = models.ForeignKey(CodeTemplate, null=False, related_name="add_ones",
-                                 related_query_name="add_ones", verbose_name="Мова програмування")
+    template = models.ForeignKey(CodeTemplate, null=False, related_name="add_ones", related_query_name="add_ones",
+                                 db_index=False, verbose_name="Мова програмування")
     name = models.CharField(max_length=30, verbose_name="Назва")
     v_type = models.CharField(max_length=30, verbose_name="Тип")
     default = models.CharField(max_length=100, default=None, verbose_name="Значення")
@@ -86,11 +90,15 @@ class AddOnes(models.Model):
         db_table = "app_add_ones"
         verbose_name = "Змінна"
         verbose_name_plural = "Змінні"
+        # Members are loaded per template in id order; the index also serves the foreign key lookups
+        indexes = [
+            models.Index(fields=["template", "id"], name="add_ones_template_idx"),
+        ]
 
 
 class FuncAddOnes(models.Model):
     template = models.ForeignKey(CodeTemplate, null=False, related_name="add_ones_func",
-                                 related_query_name="add_ones_func", verbose_name="Мова програмування")
+                                 related_query_name="add_ones_func", db_index=False, verbose_name="Мова програмування")
     name = models.CharField(max_length=30, verbose_name="Назва")
     # is_friend = models.BooleanField(default=False, verbose_name="Дружня")
     f_type = models.CharField(max_length=30, verbose_name="Тип, що повертає")
@@ -100,3 +108,42 @@ class FuncAddOnes(models.Model):
         db_table = "app_add_ones_func"
         verbose_name = "Функція"
         verbose_name_plural = "Функції"
+        # See AddOnes
+        indexes = [
+            models.Index(fields=["template", "id"], name="add_ones_func_template_idx"),
+        ]
+
+
+class GenerationJob(models.Model):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUSES = (
+        (PENDING, "Очікує"),
+        (RUNNING, "Виконується"),
+        (DONE, "Готово"),
+        (FAILED, "Помилка")
+    )
+
+    template = models.ForeignKey(CodeTemplate, null=False, on_delete=models.CASCADE, related_name="jobs",
+                                 related_query_name="jobs", verbose_name="Шаблон коду")
+    fanout = models.BooleanField(default=False, verbose_name="Всі мови")
+    status = models.CharField(max_length=10, choices=STATUSES, default=PENDING, verbose_name="Статус")
+    artifact = models.CharField(max_length=40, blank=True, default="", verbose_name="Артефакт")
+    error = models.TextField(blank=True, default="", verbose_name="Помилка")
+    create_dt = models.DateTimeField(auto_now_add=True, verbose_name="Дата створення")
+    run_after = models.DateTimeField(null=True, default=None, verbose_name="Не раніше")
+    start_dt = models.DateTimeField(null=True, default=None, verbose_name="Початок")
+    finish_dt = models.DateTimeField(null=True, default=None, verbose_name="Завершення")
+
+    class Meta:
+        db_table = "app_generation_job"
+        verbose_name = "Задача генерації"
+        verbose_name_plural = "Задачі генерації"
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="generation_job_status_idx"),
+        ]
+
+    def __str__(self):
+        return "{} [{}]".format(self.template_id, self.get_status_display())
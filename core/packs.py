@@ -0,0 +1,80 @@
+import os
+from collections import OrderedDict
+
+from django.db import transaction
+
+from .catalog import catalogs
+from .models import Function, Keyword, Language
+
+
+FORMAT = 1
+DEFAULT_PACK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalogs", "default.json")
+# Placeholder templates of the languages the default pack has none for, only loaded by the benchmark
+BENCHMARK_PACK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalogs", "benchmark.json")
+# Pack section -> model; rows are keyed by (language, value)
+SECTIONS = OrderedDict([("keywords", Keyword), ("functions", Function)])
+
+
+def export_catalog(languages=None):
+    """
+    The keyword and function templates of `languages` (names, all by default) as a language pack:
+    {"format": 1, "languages": {name: {"keywords": {value: [name, template]}, "functions": {...}}}}
+    """
+    queryset = Language.objects.order_by("pk")
+    if languages:
+        queryset = queryset.filter(name__in=languages)
+    names = dict(queryset.values_list("pk", "name"))
+    pack = OrderedDict((name, OrderedDict((section, OrderedDict()) for section in SECTIONS))
+                       for name in names.values())
+    for section, model in SECTIONS.items():
+        rows = model.objects.filter(language_id__in=names).order_by("language_id", "value")
+        for language_id, value, name, template in rows.values_list("language_id", "value", "name", "template"):
+            pack[names[language_id]][section][value] = [name, template]
+    return OrderedDict([("format", FORMAT), ("languages", pack)])
+
+
+def import_catalog(pack, replace=False):
+    """
+    Loads a language pack in one transaction: missing languages and rows are bulk created, changed
+    rows are replaced and, with `replace`, rows absent from the pack are deleted from its languages.
+    Returns the number of created, updated and deleted rows; the catalog cache is dropped on commit.
+    """
+    if pack.get("format") != FORMAT:
+        raise ValueError("Unsupported catalog pack format: {}".format(pack.get("format")))
+
+    stats = {"languages": 0, "created": 0, "updated": 0, "deleted": 0}
+    with transaction.atomic():
+        languages = dict(Language.objects.filter(name__in=list(pack["languages"])).values_list("name", "pk"))
+        missing = [name for name in pack["languages"] if name not in languages]
+        if missing:
+            Language.objects.bulk_create([Language(name=name) for name in missing])
+            languages.update(Language.objects.filter(name__in=missing).values_list("name", "pk"))
+            stats["languages"] = len(missing)
+
+        for section, model in SECTIONS.items():
+            existing = {(language_id, value): (pk, name, template) for pk, language_id, value, name, template in
+                        model.objects.filter(language_id__in=languages.values()).values_list(
+                            "pk", "language_id", "value", "name", "template")}
+            create, stale = [], []
+            for language, rows in pack["languages"].items():
+                language_id = languages[language]
+                for value, (name, template) in rows.get(section, {}).items():
+                    row = existing.pop((language_id, value), None)
+                    if row is not None:
+                        if row[1:] == (name, template):
+                            continue
+                        stale.append(row[0])
+                        stats["updated"] += 1
+                    else:
+                        stats["created"] += 1
+                    create.append(model(language_id=language_id, value=value, name=name, template=template))
+
+            if replace:
+                stale.extend(row[0] for row in existing.values())
+                stats["deleted"] += len(existing)
+            if stale:
+                model.objects.filter(pk__in=stale).delete()
+            model.objects.bulk_create(create)
+
+        transaction.on_commit(catalogs.invalidate)
+    return stats
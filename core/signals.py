@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .catalog import catalogs
+from .models import Function, Keyword, Language
+
+
+@receiver(post_save, sender=Function)
+@receiver(post_delete, sender=Function)
+@receiver(post_save, sender=Keyword)
+@receiver(post_delete, sender=Keyword)
+def invalidate_template_catalog(sender, instance, **kwargs):
+    catalogs.invalidate(instance.language_id)
+
+
+@receiver(post_save, sender=Language)
+@receiver(post_delete, sender=Language)
+def invalidate_language_catalog(sender, instance, **kwargs):
+    catalogs.invalidate(instance.pk)
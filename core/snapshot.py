@@ -0,0 +1,80 @@
+import hashlib
+import json
+from collections import namedtuple
+
+from .models import AddOnes, CodeTemplate, FuncAddOnes, Language
+
+
+# Immutable member records read straight from `values_list`: hashable, and cheap to pickle for worker processes
+Variable = namedtuple("Variable", ["name", "v_type", "default"])
+Method = namedtuple("Method", ["name", "f_type", "params"])
+# Values of optional member fields missing from a class description
+MEMBER_DEFAULTS = {"default": None, "params": ""}
+
+
+def member(record, value):
+    """A `Variable`/`Method` from a record, a dict with its field names or a sequence of its fields."""
+    if isinstance(value, record):
+        return value
+    if isinstance(value, dict):
+        return record(*[value[f] if f in value else MEMBER_DEFAULTS[f] for f in record._fields])
+    return record(*value)
+
+
+class TemplateSnapshot(object):
+    """Everything an emitter reads from a `CodeTemplate`, loaded once with a fixed member ordering."""
+
+    __slots__ = ("pk", "name", "language", "variables", "methods")
+
+    def __init__(self, pk, name, language, variables, methods):
+        self.pk = pk
+        self.name = name
+        self.language = language
+        self.variables = tuple(variables)
+        self.methods = tuple(methods)
+
+    def with_language(self, language):
+        return TemplateSnapshot(self.pk, self.name, language, self.variables, self.methods)
+
+    @classmethod
+    def from_spec(cls, name, language, variables=(), methods=()):
+        """
+        An unsaved class description; `language` is a Language or its name and members are given
+        as records, dicts or sequences (see `member`).
+        """
+        if not isinstance(language, Language):
+            language = Language.objects.get(name=language)
+        return cls(None, name, language, [member(Variable, v) for v in variables],
+                   [member(Method, m) for m in methods])
+
+    @classmethod
+    def queryset(cls):
+        return CodeTemplate.objects.select_related("language")
+
+    @staticmethod
+    def members(pks):
+        """Variables and methods of the templates `pks` as `{pk: (variables, methods)}`, two queries in total."""
+        members = {pk: ([], []) for pk in pks}
+        variables = AddOnes.objects.filter(template_id__in=pks).order_by("id")
+        for template_id, *fields in variables.values_list("template_id", *Variable._fields):
+            members[template_id][0].append(Variable(*fields))
+        methods = FuncAddOnes.objects.filter(template_id__in=pks).order_by("id")
+        for template_id, *fields in methods.values_list("template_id", *Method._fields):
+            members[template_id][1].append(Method(*fields))
+        return members
+
+    @classmethod
+    def load_many(cls, code_templates):
+        members = cls.members([t.pk for t in code_templates])
+        return [cls(t.pk, t.name, t.language, *members[t.pk]) for t in code_templates]
+
+    @classmethod
+    def load(cls, code_template):
+        return cls.load_many([code_template])[0]
+
+    def fingerprint(self, *salt):
+        data = [self.name, self.language.name,
+                [[v.name, v.v_type, v.default] for v in self.variables],
+                [[m.name, m.f_type, m.params] for m in self.methods]]
+        data.extend(salt)
+        return hashlib.sha1(json.dumps(data, ensure_ascii=False).encode("utf-8")).hexdigest()
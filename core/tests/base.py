@@ -0,0 +1,47 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.storage import FileSystemStorage
+from django.test import TestCase, override_settings
+
+from core import packs
+from core.artifacts import artifacts
+from core.catalog import catalogs
+from core.emitters.base import fragments
+from core.generator import CodeGenerator
+from core.models import AddOnes, CodeTemplate, FuncAddOnes, Language
+from core.snapshot import TemplateSnapshot
+
+
+@override_settings(GENERATOR_METRICS_SINKS=["core.metrics.histogram_sink"])
+class GeneratorTestCase(TestCase):
+    """Default language pack, one Python template and an artifact storage in a temporary directory."""
+
+    @classmethod
+    def setUpTestData(cls):
+        with open(packs.DEFAULT_PACK, encoding="utf-8") as f:
+            packs.import_catalog(json.load(f))
+        cls.python = Language.objects.get(name="Python")
+        cls.code_template = CodeTemplate.objects.create(language=cls.python, name="Point")
+        AddOnes.objects.bulk_create([AddOnes(template=cls.code_template, name="x", v_type="int", default="0"),
+                                     AddOnes(template=cls.code_template, name="y", v_type="int", default="0")])
+        FuncAddOnes.objects.create(template=cls.code_template, name="length", f_type="float")
+
+    def setUp(self):
+        catalogs.invalidate()
+        fragments.clear()
+        self.directory = tempfile.mkdtemp()
+        patcher = mock.patch.object(artifacts, "storage", FileSystemStorage(location=self.directory))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+    def generator(self, code_template=None):
+        return CodeGenerator(TemplateSnapshot.queryset().get(pk=(code_template or self.code_template).pk))
+
+    def stored_files(self):
+        return {os.path.relpath(os.path.join(root, name), self.directory)
+                for root, dirs, files in os.walk(self.directory) for name in files}
@@ -0,0 +1,39 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib import admin
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+
+from core.models import CodeTemplate, GenerationJob
+
+from .base import GeneratorTestCase
+
+
+@override_settings(GENERATOR_REGENERATE_ON_SAVE=True, GENERATOR_REGENERATE_DELAY=60)
+class RegenerateOnSaveTest(GeneratorTestCase):
+
+    def save(self):
+        model_admin = admin.site._registry[CodeTemplate]
+        form = mock.Mock(instance=self.code_template)
+        # TestCase never commits, the callback runs right away instead
+        with mock.patch("core.admin.transaction.on_commit", lambda callback: callback()):
+            model_admin.save_related(RequestFactory().post("/"), form, [], True)
+
+    def test_save_enqueues_debounced_job(self):
+        self.save()
+        job = GenerationJob.objects.get(template=self.code_template)
+        self.assertEqual(job.status, GenerationJob.PENDING)
+        self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=50))
+
+    def test_repeated_saves_share_the_job(self):
+        self.save()
+        run_after = GenerationJob.objects.get(template=self.code_template).run_after
+        self.save()
+        job = GenerationJob.objects.get(template=self.code_template)
+        self.assertGreaterEqual(job.run_after, run_after)
+
+    @override_settings(GENERATOR_REGENERATE_ON_SAVE=False)
+    def test_disabled(self):
+        self.save()
+        self.assertFalse(GenerationJob.objects.exists())
@@ -0,0 +1,60 @@
+import json
+
+from django.test import override_settings
+from django.urls import reverse
+
+from core.models import CodeTemplate
+
+from .base import GeneratorTestCase
+
+
+@override_settings(GENERATOR_API_TOKENS=["secret"])
+class GenerateApiTest(GeneratorTestCase):
+
+    def post(self, data, token="secret"):
+        headers = {"HTTP_AUTHORIZATION": "Token {}".format(token)} if token else {}
+        return self.client.post(reverse("api-generate"), json.dumps(data), content_type="application/json",
+                                **headers)
+
+    def test_token_is_required(self):
+        self.assertEqual(self.post({"template_id": self.code_template.pk}, token=None).status_code, 403)
+        self.assertEqual(self.post({"template_id": self.code_template.pk}, token="wrong").status_code, 403)
+        self.assertEqual(self.post({"template_id": self.code_template.pk}, token="été").status_code, 403)
+
+    def test_template(self):
+        response = self.post({"template_id": self.code_template.pk})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data["name"], data["language"]), ("Point", "Python"))
+        self.assertEqual(data["fingerprint"], self.generator().fingerprint())
+        self.assertIn("class Point", data["files"][0]["content"])
+
+    def test_class_description(self):
+        response = self.post({"name": "Vector", "language": "C++", "variables": [{"name": "x", "v_type": "float"}],
+                              "methods": [{"name": "norm", "f_type": "float"}]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([f["name"] for f in response.json()["files"]], ["main.cpp", "Vector.h", "Vector.cpp"])
+
+    def test_zip(self):
+        response = self.post({"template_id": self.code_template.pk, "format": "zip"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/zip")
+
+    def test_nothing_is_written(self):
+        templates = CodeTemplate.objects.count()
+        self.post({"name": "Vector", "language": "Python", "variables": [{"name": "x", "v_type": "float"}]})
+        self.post({"template_id": self.code_template.pk})
+        self.assertEqual(CodeTemplate.objects.count(), templates)
+        self.assertEqual(self.stored_files(), set())
+        self.code_template.refresh_from_db()
+        self.assertFalse(self.code_template.created_file)
+
+    def test_invalid_description(self):
+        self.assertEqual(self.post({"name": "Vector"}).status_code, 400)
+        self.assertEqual(self.post({"name": "Vector", "language": "Python", "variables": "x"}).status_code, 400)
+        self.assertEqual(self.post({"name": "V" * 31, "language": "Python"}).status_code, 400)
+        self.assertEqual(self.post([]).status_code, 400)
+
+    def test_unknown_template_or_language(self):
+        self.assertEqual(self.post({"template_id": 0}).status_code, 404)
+        self.assertEqual(self.post({"name": "Vector", "language": "Cobol"}).status_code, 404)
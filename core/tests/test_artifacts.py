@@ -0,0 +1,23 @@
+import zipfile
+
+from django.test import override_settings
+
+from core.artifacts import artifacts
+
+from .base import GeneratorTestCase
+
+
+class ArtifactStoreTest(GeneratorTestCase):
+
+    def archived(self, digest):
+        artifact = artifacts.save(digest, "Point_[Python].zip", self.generator().iter_highlighted())
+        with artifacts.storage.open(artifact.archive, "rb") as f, zipfile.ZipFile(f) as archive:
+            return {name: archive.read(name) for name in archive.namelist()}
+
+    def test_archive_spilled_to_disk(self):
+        in_memory = self.archived("0" * 40)
+        # Same file names and sources, so the archive would be reused
+        artifacts.storage.delete(artifacts.load("0" * 40).archive)
+        with override_settings(GENERATOR_ARCHIVE_SPOOL_SIZE=1):
+            self.assertEqual(self.archived("1" * 40), in_memory)
+        self.assertEqual(list(in_memory), ["Point.py"])
@@ -0,0 +1,38 @@
+from core.catalog import catalogs
+from core.models import Function, Keyword, Language
+
+from .base import GeneratorTestCase
+
+
+class CatalogInvalidationTest(GeneratorTestCase):
+
+    def test_keyword_save_reloads_catalog(self):
+        catalog = catalogs.get(self.python)
+        keyword = Keyword.objects.get(language=self.python, value="__class__")
+        keyword.template = "class %(name)s:\r\n%(code)s"
+        keyword.save()
+        self.assertIsNot(catalogs.get(self.python), catalog)
+        self.assertIn("class Point:", self.generator().render()[0]["content"])
+
+    def test_function_save_and_delete_reload_catalog(self):
+        catalog = catalogs.get(self.python)
+        function = Function.objects.create(language=self.python, value="__len__", name="Довжина",
+                                           template="def __len__(self):\r\n    return 0")
+        self.assertIn("__len__", catalogs.get(self.python).functions)
+        self.assertNotIn("__len__", catalog.functions)
+        function.delete()
+        self.assertNotIn("__len__", catalogs.get(self.python).functions)
+
+    def test_other_languages_are_kept(self):
+        java = Language.objects.get(name="Java")
+        catalog = catalogs.get(java)
+        Keyword.objects.filter(language=self.python, value="__class__").get().save()
+        self.assertIs(catalogs.get(java), catalog)
+
+    def test_update_without_signal_is_not_seen(self):
+        catalog = catalogs.get(self.python)
+        # A queryset update sends no signal; other processes rely on GENERATOR_CATALOG_TTL the same way
+        Keyword.objects.filter(language=self.python, value="__class__").update(template="class %(name)s:\r\n%(code)s")
+        self.assertIs(catalogs.get(self.python), catalog)
+        with self.settings(GENERATOR_CATALOG_TTL=0):
+            self.assertIsNot(catalogs.get(self.python), catalog)
@@ -0,0 +1,35 @@
+from django.test import SimpleTestCase
+
+from core.compiler import compile_template, indent_lines
+
+
+class CompiledTemplateTest(SimpleTestCase):
+
+    def test_render(self):
+        template = compile_template("def %(name)s(self):\n    return %(value)s")
+        self.assertEqual(template.slots, ["name", "value"])
+        self.assertEqual(template.render({"name": "get", "value": 1}), "def get(self):\n    return 1")
+
+    def test_escapes(self):
+        template = compile_template("%(a)s %% %(b)s {{ }} 100%%")
+        self.assertEqual(template.render({"a": "x", "b": "y"}), "x % y { } 100%")
+        # Escapes are only undone in the template text, never in the values
+        self.assertEqual(template.render({"a": "{{", "b": "%%"}), "{{ % %% { } 100%")
+
+    def test_literal(self):
+        source = "printf(\"%(name)s %%d\") {{ }}"
+        self.assertEqual(compile_template(source, literal=True).render(), source)
+
+    def test_list_values_are_spliced(self):
+        parts = compile_template("[%(items)s]").render_into(["<"], {"items": ["a", ", ", "b"]})
+        self.assertEqual(parts, ["<", "[", "a", ", ", "b", "]"])
+
+    def test_compiled_once(self):
+        self.assertIs(compile_template("%(name)s"), compile_template("%(name)s"))
+        self.assertIsNot(compile_template("%(name)s"), compile_template("%(name)s", literal=True))
+
+    def test_indent_lines(self):
+        self.assertEqual(indent_lines("a\nb", 2), "  a\n  b")
+        self.assertEqual(indent_lines("a\nb", 0), "a\nb")
+        template = compile_template(indent_lines("x = %(x)s\ny = %%", 4))
+        self.assertEqual(template.render({"x": 1}), "    x = 1\n    y = %")
@@ -0,0 +1,64 @@
+from django.test import override_settings
+
+from core import emitters
+from core.emitters.go import GoEmitter
+from core.emitters.python import PythonEmitter
+from core.generator import CodeGenerator
+
+from .base import GeneratorTestCase
+
+
+VARIABLES = [{"name": "x", "v_type": "int", "default": "0"}, {"name": "label", "v_type": "str", "default": ""}]
+METHODS = [{"name": "length", "f_type": "float"}]
+
+
+class EmitterTest(GeneratorTestCase):
+
+    def render(self, language):
+        files = CodeGenerator.from_spec("Point", language, VARIABLES, METHODS).render()
+        self.assertEqual(len(files), 1)
+        return files[0]["name"], files[0]["content"]
+
+    def assertLines(self, content, lines):
+        for line in lines:
+            self.assertIn(line, content.split("\n"))
+
+    def test_typescript(self):
+        name, content = self.render("TypeScript")
+        self.assertEqual(name, "Point.ts")
+        self.assertLines(content, [
+            "export class Point {",
+            "    public x: number;",
+            "    public label: string;",
+            '    constructor(x: number = 0, label: string = "") {',
+            "        this.x = x;",
+            "    public length(): number {",
+        ])
+
+    def test_kotlin(self):
+        name, content = self.render("Kotlin")
+        self.assertEqual(name, "Point.kt")
+        self.assertLines(content, [
+            "class Point(",
+            "    var x: Int = 0,",
+            '    var label: String = ""',
+            "    override fun equals(other: Any?): Boolean = this === other",
+            "    fun length(): Double {",
+        ])
+
+    def test_go(self):
+        name, content = self.render("Go")
+        self.assertEqual(name, "point.go")
+        self.assertLines(content, [
+            "type Point struct {",
+            "    x int",
+            "    label string",
+            "func NewPoint(x int, label string) *Point {",
+            "    return &Point{x: x, label: label}",
+            "func (o *Point) length() float64 {",
+        ])
+
+    def test_registry(self):
+        self.assertIs(emitters.get("Cobol"), PythonEmitter)
+        with override_settings(GENERATOR_EMITTERS={"Python": "core.emitters.go.GoEmitter"}):
+            self.assertIs(emitters.get("Python"), GoEmitter)
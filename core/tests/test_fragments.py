@@ -0,0 +1,37 @@
+from unittest import mock
+
+from core.emitters.base import fragments
+from core.models import AddOnes, CodeTemplate, FuncAddOnes, Language
+
+from .base import GeneratorTestCase
+
+
+class FragmentCacheTest(GeneratorTestCase):
+
+    def rendered(self, code_template=None):
+        """Kind and inputs of every fragment rendered (not taken from the cache) by a generation."""
+        with mock.patch.object(fragments, "set", wraps=fragments.set) as rendered:
+            self.generator(code_template).render()
+        return [key[2:] for (key, value), kwargs in rendered.call_args_list]
+
+    def test_unchanged_template_renders_no_fragment(self):
+        self.rendered()
+        self.assertEqual(self.rendered(), [])
+
+    def test_changed_member_is_rendered_alone(self):
+        self.rendered()
+        AddOnes.objects.filter(template=self.code_template, name="y").update(default="5")
+        self.assertEqual(self.rendered(), [("py-init", "y", "int", "5")])
+
+    def test_changed_type_renders_every_fragment_of_the_member(self):
+        code_template = CodeTemplate.objects.create(language=Language.objects.get(name="C++"), name="Pair")
+        AddOnes.objects.bulk_create([AddOnes(template=code_template, name="a", v_type="int", default="0"),
+                                     AddOnes(template=code_template, name="b", v_type="int", default="1")])
+        FuncAddOnes.objects.create(template=code_template, name="describe", f_type="str")
+        self.rendered(code_template)
+        AddOnes.objects.filter(template=code_template, name="b").update(v_type="str")
+        rendered = self.rendered(code_template)
+        # Header and source versions of the accessors
+        self.assertEqual(sorted(key[0] for key in rendered),
+                         ["cpp-field", "cpp-getter", "cpp-getter", "cpp-param", "cpp-setter", "cpp-setter"])
+        self.assertTrue(all(key[-2:] == ("b", "str") for key in rendered))
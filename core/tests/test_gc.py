@@ -0,0 +1,127 @@
+import os
+import posixpath
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.utils import timezone
+
+from core.artifacts import artifacts
+from core.gc import Collector, collect
+from core.models import AddOnes, CodeTemplate, FuncAddOnes, GenerationJob
+
+from .base import GeneratorTestCase
+
+
+class ArtifactCollectionTest(GeneratorTestCase):
+
+    def age(self, seconds):
+        past = time.time() - seconds
+        for name in self.stored_files():
+            os.utime(os.path.join(self.directory, name), (past, past))
+
+    def orphan(self):
+        """Generates the template, then renames it so the first artifact is no longer referenced."""
+        generator = self.generator()
+        generator.generate()
+        old = artifacts.load(generator.fingerprint())
+        self.code_template.name = "Renamed"
+        self.code_template.save()
+        self.generator().generate()
+        return old
+
+    def test_unreferenced_artifact_is_deleted(self):
+        old = self.orphan()
+        self.age(3600)
+        stats = collect(min_age=timedelta(minutes=1))
+        self.assertEqual(stats["artifacts"], 1)
+        self.assertIsNone(artifacts.load(old.digest))
+        self.assertFalse(artifacts.storage.exists(old.archive))
+        current = artifacts.load(self.generator().fingerprint())
+        self.assertTrue(all(artifacts.storage.exists(f["source"]) for f in current.files))
+        self.assertEqual(list(artifacts.iter_files(current))[0]["name"], "Renamed.py")
+
+    def test_young_files_are_kept(self):
+        self.orphan()
+        files = self.stored_files()
+        stats = collect()
+        self.assertEqual((stats["artifacts"], stats["files"]), (0, 0))
+        self.assertEqual(self.stored_files(), files)
+
+    def test_dry_run_deletes_nothing(self):
+        self.orphan()
+        self.age(3600)
+        files = self.stored_files()
+        stats = collect(min_age=timedelta(minutes=1), dry_run=True)
+        self.assertEqual(stats["artifacts"], 1)
+        self.assertEqual(self.stored_files(), files)
+
+    def job(self, artifact, hours):
+        return GenerationJob.objects.create(template=self.code_template, status=GenerationJob.DONE,
+                                            artifact=artifact.digest, finish_dt=timezone.now() - timedelta(hours=hours))
+
+    def test_artifact_of_newest_finished_job_is_kept(self):
+        old = self.orphan()
+        self.job(old, hours=2)
+        self.age(3600)
+        stats = collect(min_age=timedelta(minutes=1))
+        self.assertEqual((stats["artifacts"], stats["jobs"]), (0, 0))
+        self.assertIsNotNone(artifacts.load(old.digest))
+
+    def test_artifact_of_recent_finished_job_is_kept(self):
+        old = self.orphan()
+        self.job(old, hours=0)
+        self.job(artifacts.load(self.generator().fingerprint()), hours=0)
+        self.age(3600)
+        self.assertEqual(collect(min_age=timedelta(minutes=1))["artifacts"], 0)
+        self.assertIsNotNone(artifacts.load(old.digest))
+
+    def test_superseded_job_artifact_is_collected(self):
+        old = self.orphan()
+        superseded = self.job(old, hours=2)
+        newest = self.job(artifacts.load(self.generator().fingerprint()), hours=2)
+        self.age(3600)
+        stats = collect(min_age=timedelta(minutes=1))
+        self.assertEqual((stats["artifacts"], stats["jobs"]), (1, 1))
+        self.assertIsNone(artifacts.load(old.digest))
+        self.assertEqual(list(GenerationJob.objects.all()), [newest])
+        self.assertNotEqual(newest.pk, superseded.pk)
+
+    def test_dry_run_keeps_expired_jobs(self):
+        old = self.orphan()
+        self.job(old, hours=2)
+        self.job(artifacts.load(self.generator().fingerprint()), hours=2)
+        self.age(3600)
+        stats = collect(min_age=timedelta(minutes=1), dry_run=True)
+        self.assertEqual((stats["artifacts"], stats["jobs"]), (1, 1))
+        self.assertEqual(GenerationJob.objects.count(), 2)
+
+    def test_reused_blob_is_kept(self):
+        old = self.orphan()
+        artifacts.storage.delete(posixpath.join(artifacts.directory(old.digest), artifacts.MANIFEST))
+        self.age(3600)
+        self.code_template.name = "Point"
+        self.code_template.save()
+        mark = Collector.mark
+
+        def concurrent_generation(collector, *args):
+            # The old blobs are orphans when marked; a generation of the first name reuses them before the sweep
+            result = mark(collector, *args)
+            self.generator().generate()
+            return result
+
+        with mock.patch.object(Collector, "mark", concurrent_generation):
+            collect(min_age=timedelta(minutes=1))
+        current = artifacts.load(old.digest)
+        names = [current.archive] + [name for f in current.files for name in (f["source"], f["content"])]
+        self.assertTrue(all(artifacts.storage.exists(name) for name in names))
+
+    def test_identical_output_is_stored_once(self):
+        copy = CodeTemplate.objects.create(language=self.python, name="Point")
+        AddOnes.objects.bulk_create([AddOnes(template=copy, name=v.name, v_type=v.v_type, default=v.default)
+                                     for v in self.code_template.add_ones.all()])
+        FuncAddOnes.objects.create(template=copy, name="length", f_type="float")
+        self.generator().generate()
+        files = self.stored_files()
+        self.generator(copy).generate()
+        self.assertEqual(self.stored_files(), files)
@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from core import jobs
+from core.artifacts import artifacts
+from core.catalog import catalogs
+from core.models import GenerationJob, Keyword
+
+from .base import GeneratorTestCase
+
+
+class GenerationJobTest(GeneratorTestCase):
+
+    def test_enqueue_reuses_unfinished_job(self):
+        job = jobs.enqueue(self.code_template)
+        self.assertEqual(jobs.enqueue(self.code_template).pk, job.pk)
+        self.assertNotEqual(jobs.enqueue(self.code_template, fanout=True).pk, job.pk)
+
+    def test_debounced_job_is_not_claimed_before_it_is_due(self):
+        job = jobs.enqueue(self.code_template, delay=60)
+        self.assertIsNone(jobs.claim_next())
+        # A viewer waiting for the code makes it due at once
+        self.assertEqual(jobs.enqueue(self.code_template).pk, job.pk)
+        self.assertEqual(jobs.claim_next().pk, job.pk)
+
+    def test_claimed_job_is_not_claimed_twice(self):
+        jobs.enqueue(self.code_template)
+        job = jobs.claim_next()
+        self.assertEqual(job.status, GenerationJob.RUNNING)
+        self.assertIsNone(jobs.claim_next())
+
+    def test_run_stores_artifact(self):
+        jobs.enqueue(self.code_template)
+        job = jobs.run(jobs.claim_next())
+        self.assertEqual(job.status, GenerationJob.DONE)
+        self.assertEqual(job.artifact, self.generator().fingerprint())
+        self.assertIsNotNone(artifacts.load(job.artifact))
+        self.code_template.refresh_from_db()
+        self.assertEqual(self.code_template.created_file.name, artifacts.load(job.artifact).archive)
+
+    def test_run_reloads_stale_catalog(self):
+        catalogs.get(self.python)
+        # An edit made by another process: no signal reaches this one
+        Keyword.objects.filter(language=self.python, value="__class__").update(
+            template="class %(name)s:\r\n%(code)s")
+        jobs.enqueue(self.code_template)
+        job = jobs.run(jobs.claim_next())
+        catalogs.invalidate()
+        self.assertEqual(job.artifact, self.generator().fingerprint())
+
+    def test_run_records_failure(self):
+        Keyword.objects.filter(language=self.python, value="__class__").delete()
+        jobs.enqueue(self.code_template)
+        with self.assertLogs("core.jobs", "ERROR"):
+            job = jobs.run(jobs.claim_next())
+        self.assertEqual(job.status, GenerationJob.FAILED)
+        self.assertIn("AssertionError", job.error)
+
+    def test_requeue_stale(self):
+        jobs.enqueue(self.code_template)
+        job = jobs.claim_next()
+        GenerationJob.objects.filter(pk=job.pk).update(start_dt=timezone.now() - timedelta(hours=1))
+        self.assertEqual(jobs.requeue_stale(600), 1)
+        self.assertEqual(jobs.claim_next().pk, job.pk)
+
+    def test_expired(self):
+        finished = timezone.now() - timedelta(hours=2)
+        old, failed, newest = [GenerationJob.objects.create(template=self.code_template, status=status,
+                                                            finish_dt=finished)
+                               for status in (GenerationJob.DONE, GenerationJob.FAILED, GenerationJob.DONE)]
+        fanout = GenerationJob.objects.create(template=self.code_template, fanout=True, status=GenerationJob.DONE,
+                                              finish_dt=finished)
+        young = GenerationJob.objects.create(template=self.code_template, status=GenerationJob.FAILED,
+                                             finish_dt=timezone.now())
+        pending = GenerationJob.objects.create(template=self.code_template)
+        self.assertEqual(set(jobs.expired(timedelta(hours=1))), {old, failed})
+        self.assertEqual(jobs.prune(jobs.expired(timedelta(hours=1)).values_list("pk", flat=True)), 2)
+        self.assertEqual(set(GenerationJob.objects.all()), {newest, fanout, young, pending})
@@ -0,0 +1,35 @@
+import logging
+import os
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+
+from core.metrics import histogram
+
+from .base import GeneratorTestCase
+
+
+class MetricsTest(GeneratorTestCase):
+
+    @override_settings(GENERATOR_METRICS_SINKS=["core.metrics.log_sink", "core.metrics.histogram_sink"])
+    def test_failing_sink_does_not_fail_generation(self):
+        # A log file in a directory that does not exist: the handler raises on the first record
+        handler = logging.FileHandler(os.path.join(self.directory, "missing", "logfile.txt"), delay=True)
+        logger = logging.getLogger("core.metrics")
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        self.addCleanup(logger.setLevel, logger.level)
+        logger.setLevel(logging.INFO)
+        histogram.clear()
+        with self.assertWarnsRegex(RuntimeWarning, "log_sink"):
+            self.generator().generate()
+        self.assertEqual(histogram.summary()[-1]["count"], 1)
+
+    def test_stats_page_is_linked_from_the_jobs(self):
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "admin"))
+        url = reverse("admin:generation-stats")
+        self.assertContains(self.client.get(reverse("admin:core_generationjob_changelist")), url)
+        histogram.clear()
+        self.generator().generate()
+        self.assertContains(self.client.get(url), "<td>total</td>")
@@ -0,0 +1,54 @@
+import json
+import os
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+
+from core import packs
+from core.models import Function, Keyword, Language
+
+from .base import GeneratorTestCase
+
+
+class ImportCatalogTest(GeneratorTestCase):
+
+    def import_catalog(self, pack, *args):
+        path = os.path.join(self.directory, "pack.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(pack, f)
+        out = StringIO()
+        call_command("import_catalog", path, *args, stdout=out)
+        return out.getvalue().split(": ", 1)[1].strip()
+
+    def python_pack(self):
+        return json.loads(json.dumps(packs.export_catalog(["Python"])))
+
+    def test_create(self):
+        pack = {"format": 1, "languages": {"Rust": {"keywords": {"__class__": ["struct", "struct %(name)s {}"]}}}}
+        self.assertEqual(self.import_catalog(pack), "1 languages, 1 created, 0 updated, 0 deleted")
+        self.assertEqual(Keyword.objects.get(language__name="Rust", value="__class__").template, "struct %(name)s {}")
+
+    def test_update(self):
+        pack = self.python_pack()
+        self.assertEqual(self.import_catalog(pack), "0 languages, 0 created, 0 updated, 0 deleted")
+        pack["languages"]["Python"]["keywords"]["__class__"][1] = "class %(name)s:\r\n%(code)s"
+        self.assertEqual(self.import_catalog(pack), "0 languages, 0 created, 1 updated, 0 deleted")
+        self.assertEqual(Keyword.objects.get(language=self.python, value="__class__").template,
+                         "class %(name)s:\r\n%(code)s")
+
+    def test_replace(self):
+        pack = self.python_pack()
+        functions = pack["languages"]["Python"]["functions"]
+        pack["languages"]["Python"]["functions"] = {"__init__": functions["__init__"]}
+        cpp = Function.objects.filter(language__name="C++").count()
+        self.assertEqual(self.import_catalog(pack), "0 languages, 0 created, 0 updated, 0 deleted")
+        self.assertEqual(self.import_catalog(pack, "--replace"),
+                         "0 languages, 0 created, 0 updated, {} deleted".format(len(functions) - 1))
+        self.assertEqual(list(Function.objects.filter(language=self.python).values_list("value", flat=True)),
+                         ["__init__"])
+        self.assertEqual(Function.objects.filter(language__name="C++").count(), cpp)
+        self.assertEqual(Language.objects.filter(name="Python").count(), 1)
+
+    def test_unsupported_format(self):
+        with self.assertRaisesRegex(CommandError, "Unsupported catalog pack format"):
+            self.import_catalog({"format": 2, "languages": {}})
@@ -0,0 +1,32 @@
+from core.generator import CodeGenerator
+from core.models import AddOnes
+from core.snapshot import TemplateSnapshot
+
+from .base import GeneratorTestCase
+
+
+class GenerationQueriesTest(GeneratorTestCase):
+
+    def test_cold_generation(self):
+        code_template = TemplateSnapshot.queryset().get(pk=self.code_template.pk)
+        # Both member lists, keywords and functions of the catalog, the created_file update
+        with self.assertNumQueries(5):
+            files = CodeGenerator(code_template).generate()
+        self.assertEqual([f["name"] for f in files], ["Point.py"])
+
+    def test_warm_generation(self):
+        self.generator().generate()
+        code_template = TemplateSnapshot.queryset().get(pk=self.code_template.pk)
+        with self.assertNumQueries(2):
+            CodeGenerator(code_template).generate()
+
+    def test_query_count_does_not_grow_with_members(self):
+        AddOnes.objects.bulk_create([AddOnes(template=self.code_template, name="field{}".format(i), v_type="str",
+                                             default="") for i in range(50)])
+        code_template = TemplateSnapshot.queryset().get(pk=self.code_template.pk)
+        with self.assertNumQueries(5):
+            CodeGenerator(code_template).generate()
+
+    def test_trace_counts_queries(self):
+        generator = self.generator()
+        self.assertEqual(generator.trace.queries, 4)
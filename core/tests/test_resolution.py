@@ -0,0 +1,61 @@
+from django.test import TestCase
+
+from core.catalog import LanguageCatalog, catalogs
+from core.emitters.go import GoEmitter
+from core.emitters.java import JavaEmitter
+from core.emitters.kotlin import KotlinEmitter
+from core.emitters.resolution import ResolutionTable, split_arguments
+from core.emitters.typescript import TypeScriptEmitter
+from core.models import Language
+
+
+class ResolutionTableTest(TestCase):
+
+    def table(self, emitter, language):
+        return ResolutionTable(emitter, catalogs.get(Language.objects.get_or_create(name=language)[0]))
+
+    def assertResolved(self, table, resolved):
+        self.assertEqual({type_name: tuple(table.resolve(type_name)) for type_name in resolved}, resolved)
+
+    def test_generic_types(self):
+        self.assertResolved(self.table(KotlinEmitter, "Kotlin"), {
+            "list[int]": ("List<Int>", "list"),
+            "map[str, float]": ("Map<String, Double>", "map"),
+            "dict[str, list[int?]]": ("Map<String, List<Int?>>", "map"),
+            "str?": ("String?", "nullable"),
+        })
+        self.assertResolved(self.table(GoEmitter, "Go"), {
+            "list[str]": ("[]string", "list"),
+            "map[str, list[int]]": ("map[string][]int", "map"),
+            "float?": ("*float64", "nullable"),
+        })
+        self.assertResolved(self.table(TypeScriptEmitter, "TypeScript"), {
+            "list[bool?]": ("Array<boolean | null>", "list"),
+        })
+
+    def test_java_boxes_type_arguments(self):
+        self.assertResolved(self.table(JavaEmitter, "Java"), {
+            "int": ("int", "scalar"),
+            "list[int]": ("java.util.List<Integer>", "list"),
+            "map[long, list[boolean]]": ("java.util.Map<Long, java.util.List<Boolean>>", "map"),
+            "map[String, double]": ("java.util.Map<String, Double>", "map"),
+        })
+
+    def test_malformed_types_are_kept(self):
+        self.assertResolved(self.table(KotlinEmitter, "Kotlin"), {
+            "list[int, str]": ("list[int, str]", "scalar"),
+            "map[str]": ("map[str]", "scalar"),
+            "list[]": ("list[]", "scalar"),
+            "?": ("?", "scalar"),
+        })
+
+    def test_keyword_is_never_parsed(self):
+        catalog = LanguageCatalog(None, "Kotlin", {"list[int]": "IntArray", "int": "Int"}, {})
+        self.assertResolved(ResolutionTable(KotlinEmitter, catalog), {
+            "list[int]": ("IntArray", "scalar"),
+            "list[list[int]]": ("List<IntArray>", "list"),
+        })
+
+    def test_split_arguments(self):
+        self.assertEqual(split_arguments("str, map[int, list[str]]"), ["str", "map[int, list[str]]"])
+        self.assertEqual(split_arguments(" int "), ["int"])
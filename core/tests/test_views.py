@@ -0,0 +1,72 @@
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+
+from core.artifacts import artifacts
+from core.models import AddOnes
+
+from .base import GeneratorTestCase
+
+
+class ArtifactViewTest(GeneratorTestCase):
+
+    def setUp(self):
+        super().setUp()
+        generator = self.generator()
+        generator.generate()
+        self.artifact = artifacts.load(generator.fingerprint())
+
+    def assertRevalidated(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "public, max-age=31536000, immutable")
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached["ETag"], response["ETag"])
+        return response
+
+    def test_archive(self):
+        response = self.assertRevalidated(reverse("artifact-download", args=[self.artifact.digest]))
+        self.assertEqual(response["Content-Type"], "application/zip")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="Point_Python.zip"')
+
+    def test_file(self):
+        response = self.assertRevalidated(reverse("artifact-file", args=[self.artifact.digest, 0]))
+        self.assertIn("Point", response.content.decode("utf-8"))
+
+    def test_line_range(self):
+        url = reverse("artifact-file", args=[self.artifact.digest, 0])
+        response = self.assertRevalidated(url + "?start=3&end=3")
+        content = response.content.decode("utf-8")
+        self.assertIn('<span class="normal">3</span>', content)
+        self.assertIn("__init__", content)
+        self.assertNotIn("length", content)
+        self.assertNotEqual(response["ETag"], self.client.get(url)["ETag"])
+        self.assertEqual(self.client.get(url + "?start=first").status_code, 400)
+
+    def test_unknown_artifact(self):
+        self.assertEqual(self.client.get(reverse("artifact-download", args=["0" * 40])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("artifact-file", args=[self.artifact.digest, 1])).status_code, 404)
+
+
+@override_settings(GENERATOR_ASYNC=False)
+class CodeViewTest(GeneratorTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "admin"))
+        self.url = reverse("admin:view-code", args=[self.code_template.pk])
+
+    def test_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        self.assertTrue(response["ETag"].startswith('"{}-'.format(self.generator().fingerprint())))
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+
+    def test_changed_template_is_sent_again(self):
+        etag = self.client.get(self.url)["ETag"]
+        AddOnes.objects.create(template=self.code_template, name="z", v_type="int", default="0")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
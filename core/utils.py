@@ -1,24 +1,97 @@
+import sys
+import threading
 import zipfile
+from collections import OrderedDict
 from io import BytesIO
 
+from django.conf import settings
+from django.core.files import File
+
+
+COMPRESSIONS = {
+    "stored": zipfile.ZIP_STORED,
+    "deflated": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+# `ZipFile(compresslevel=...)` exists since Python 3.7, older interpreters use the zlib default
+COMPRESSLEVEL_SUPPORTED = sys.version_info >= (3, 7)
+
 
 class InMemoryZip(object):
-    def __init__(self):
-        self.in_memory_zip = BytesIO()
+    """Zip archive that keeps one `ZipFile` open while entries are appended to it."""
+
+    def __init__(self, fileobj=None, compression="deflated", compresslevel=None):
+        self.in_memory_zip = BytesIO() if fileobj is None else fileobj
+        options = {}
+        if compresslevel is not None and COMPRESSLEVEL_SUPPORTED:
+            options["compresslevel"] = compresslevel
+        self.zip_file = zipfile.ZipFile(self.in_memory_zip, "w", COMPRESSIONS[compression], False, **options)
+
+    @classmethod
+    def from_settings(cls, fileobj=None):
+        return cls(fileobj, compression=getattr(settings, "GENERATOR_ZIP_COMPRESSION", "deflated"),
+                   compresslevel=getattr(settings, "GENERATOR_ZIP_COMPRESSLEVEL", None))
 
     def append(self, filename_in_zip, file_contents):
-        zf = zipfile.ZipFile(self.in_memory_zip, "a", zipfile.ZIP_DEFLATED, False)
-        zf.writestr(filename_in_zip, file_contents)
-        for z_file in zf.filelist:
-            z_file.create_system = 0
+        self.zip_file.writestr(filename_in_zip, file_contents)
+        self.zip_file.filelist[-1].create_system = 0
+        return self
 
+    def close(self):
+        if self.zip_file.fp is not None:
+            self.zip_file.close()
         return self
 
+    def as_file(self, name):
+        self.close()
+        self.in_memory_zip.seek(0)
+        return File(self.in_memory_zip, name)
+
     def read(self):
+        self.close()
         self.in_memory_zip.seek(0)
         return self.in_memory_zip.read()
 
-    def write_to_file(self, filename):
-        f = open(filename, "wb")
-        f.write(self.read())
-        f.close()
+
+class LRUCache(object):
+    """Thread safe mapping that evicts the least recently used entries beyond `max_entries` (int or callable)."""
+
+    def __init__(self, max_entries):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._max_entries = max_entries
+
+    @property
+    def max_entries(self):
+        return self._max_entries() if callable(self._max_entries) else self._max_entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return default
+            return self._entries[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            max_entries = self.max_entries
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_set(self, key, factory, *args):
+        value = self.get(key)
+        if value is None:
+            value = factory(*args)
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -1,6 +1,20 @@
+import json
+import posixpath
+
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import render
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from django.utils.http import quote_etag
+from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import View
 
+from core.utils import InMemoryZip
+from . import api
+from .artifacts import artifacts
+from .highlighting import highlighter
+from .models import CodeTemplate, Language
+
 
 class BaseView(View):
 
@@ -8,3 +22,105 @@ class BaseView(View):
 
     def get(self, request):
         return render(request, self.template_name, {})
+
+
+class ArtifactDownloadView(View):
+    """
+    Serves a generated archive by its fingerprint. The content behind a fingerprint never changes,
+    so the response is cacheable forever and revalidation is answered with 304 from the ETag alone.
+    """
+
+    CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+    def get(self, request, digest):
+        etag = quote_etag(digest)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            artifact = artifacts.load(digest)
+            if artifact is None:
+                raise Http404("Artifact {} does not exist".format(digest))
+
+            response = FileResponse(artifacts.storage.open(artifact.archive, "rb"), content_type="application/zip")
+            response["Content-Length"] = artifacts.storage.size(artifact.archive)
+            response["Content-Disposition"] = 'attachment; filename="{}"'.format(
+                posixpath.basename(artifact.archive))
+        response["ETag"] = etag
+        response["Cache-Control"] = self.CACHE_CONTROL
+        return response
+
+
+class ArtifactFileView(View):
+    """
+    The highlighted HTML of one file of an artifact for the code view, the whole file or lines
+    `?start=` to `?end=` of it. Cacheable forever like the archive, the fingerprint pins the content.
+    """
+
+    def get(self, request, digest, index):
+        start, end = request.GET.get("start"), request.GET.get("end")
+        etag = quote_etag("{}-{}-{}-{}".format(digest, index, start or "", end or ""))
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            artifact = artifacts.load(digest)
+            if artifact is None or int(index) >= len(artifact.files):
+                raise Http404("File {} of artifact {} does not exist".format(index, digest))
+
+            f = artifact.files[int(index)]
+            if start is None and end is None:
+                content = artifacts.read(f["content"])
+            else:
+                try:
+                    start, end = max(1, int(start or 1)), int(end) if end else None
+                except ValueError:
+                    return HttpResponseBadRequest("Invalid line range")
+                content = highlighter.highlight_lines(artifacts.read(f["source"]), f.get("lexer", "text"), start, end)
+            response = HttpResponse(content)
+        response["ETag"] = etag
+        response["Cache-Control"] = ArtifactDownloadView.CACHE_CONTROL
+        return response
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class GenerateView(View):
+    """
+    Generation API for scripts: POST a class description or a template id (see `api.generator_for`) and
+    get the sources as JSON, or the archive with "format": "zip". Sources are rendered in memory, a stored
+    artifact is only read, nothing is written to the database or the storage.
+    """
+
+    def error(self, message, status):
+        return JsonResponse({"error": message}, status=status)
+
+    def post(self, request):
+        if not api.authorized(request):
+            return self.error("Invalid or missing API token", 403)
+        try:
+            data = json.loads(request.body.decode("utf-8"))
+            generator = api.generator_for(data)
+        except (ValueError, TypeError) as e:
+            return self.error(str(e), 400)
+        except (CodeTemplate.DoesNotExist, Language.DoesNotExist) as e:
+            return self.error(str(e), 404)
+
+        artifact = generator.get_artifact(build=False)
+        if artifact is not None:
+            files = artifacts.iter_files(artifact, highlighted=False)
+        else:
+            files = ({"name": f["name"], "source": f["content"]} for f in generator.render())
+
+        if data.get("format") == "zip":
+            archive = InMemoryZip.from_settings()
+            for f in files:
+                archive.append(f["name"], f["source"])
+            response = HttpResponse(archive.read(), content_type="application/zip")
+            response["Content-Disposition"] = 'attachment; filename="{}_[{}].zip"'.format(
+                generator.class_name, generator.language.name)
+        else:
+            response = JsonResponse({
+                "name": generator.class_name,
+                "language": generator.language.name,
+                "fingerprint": generator.fingerprint(),
+                "files": [{"name": f["name"], "content": f["source"]} for f in files]
+            })
+        generator.trace.report()
+        response["Server-Timing"] = generator.trace.server_timing()
+        return response